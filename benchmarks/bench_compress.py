@@ -0,0 +1,92 @@
+# ###################################################################################################################
+'''
+
+Benchmark for compressed output of sheet2export macro
+
+Run it from command line, FreeCAD is not needed:
+python3 benchmarks/bench_compress.py
+
+It creates spreadsheet XML with text and numbers ( see sheetgen.py ) and exports it to temporary folder 
+for each file type, with and without compression ( sCompress setting ). It shows bytes written to disk and wall time of the export,
+together with the time of reading the spreadsheet to the database once.
+
+'''
+# ###################################################################################################################
+
+
+import os, sys, time, tempfile
+
+
+# ###################################################################################################################
+# Benchmark Settings ( CHANGE HERE IF NEEDED )
+# ###################################################################################################################
+
+
+# spreadsheet size
+bRows = 800
+bCols = 50
+
+# file types to export
+bFileTypes = ( "csv", "html", "json", "md" )
+
+# compression to compare
+bCompress = ( "no", "gz", "bz2", "xz" )
+
+
+# ###################################################################################################################
+# Benchmark
+# ###################################################################################################################
+
+
+# ###################################################################################################################
+def runExport(iDB, iFileType, iCompress, iPath):
+
+	vFile = S.getFilePath(iPath, "bench", iFileType, iCompress)
+
+	start = time.perf_counter()
+	S.exportDB(iDB, [ { "sFileType": iFileType, "sCompress": iCompress } ], [ vFile ])
+	end = time.perf_counter()
+
+	return os.path.getsize(vFile), end - start
+
+
+# ###################################################################################################################
+# MAIN
+# ###################################################################################################################
+
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import sheet2export as S
+import sheetgen as G
+
+vContent, vValues = G.getContent(bRows, bCols, iDensity=1.0, iSpans=0, iFormula=0, iNumber=0.5)
+
+start = time.perf_counter()
+vDB = S.SheetDB()
+S.setDB(vDB, vContent)
+end = time.perf_counter()
+
+info = "\n\ncells: " + str(bRows * bCols) + ", read to database: %.3f s\n\n" % (end - start)
+info += "type\tcompress\tbytes\t\tratio\ttime [s]\n"
+
+with tempfile.TemporaryDirectory() as vPath:
+
+	for vFileType in bFileTypes:
+
+		vPlain = 0
+
+		for vCompress in bCompress:
+
+			vSize, vTime = runExport(vDB, vFileType, vCompress, vPath)
+
+			if vCompress == "no":
+				vPlain = vSize
+
+			info += vFileType + "\t" + vCompress + "\t\t" + str(vSize).ljust(10) + "\t"
+			info += "%.3f\t%.3f\n" % (vSize / vPlain, vTime)
+
+print(info)
+
+
+# ###################################################################################################################
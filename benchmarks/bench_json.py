@@ -0,0 +1,132 @@
+# ###################################################################################################################
+'''
+
+Benchmark for JSON export of sheet2export macro
+
+Run it from command line, FreeCAD is not needed:
+python3 benchmarks/bench_json.py
+
+It creates spreadsheet XML with growing number of rows and text in all cells ( see sheetgen.py ), 
+and measures the time of setOUTPUT() for JSON file type with rows streamed to the file 
+( sStreamOUT = "yes" ). The time per row should stay about the same for each size, if it grows together with the number of rows the JSON writer copies 
+already written output again.
+
+There is warm-up run before the measure and the best time of bRepeat runs is taken for each size, 
+so single slow run does not break the check. The growth is the slope of log(time) to log(rows) 
+fitted over all sizes, it is about 1 for linear writer and about 2 for writer copying the output 
+for each row. The script exits with code 1 if the growth is bigger than bMaxGrowth.
+
+'''
+# ###################################################################################################################
+
+
+import os, sys, gc, time
+
+
+# ###################################################################################################################
+# Benchmark Settings ( CHANGE HERE IF NEEDED )
+# ###################################################################################################################
+
+
+# number of rows for each spreadsheet
+bRows = ( 400, 800, 1600, 3200, 6400 )
+
+# number of columns for each spreadsheet
+bCols = 20
+
+# runs for each size, the best time is taken
+bRepeat = 5
+
+# max allowed growth, time grows as rows ** growth
+bMaxGrowth = 1.5
+
+
+# ###################################################################################################################
+# Benchmark
+# ###################################################################################################################
+
+
+# ###################################################################################################################
+def runJSON(iDB):
+
+	vEX = S.Export({ "sFileType": "json" })
+	vEX.db = iDB
+
+	vEX.stream = open(os.devnull, 'w')
+
+	gc.collect()
+	start = time.perf_counter()
+	S.setOUTPUT(vEX)
+	end = time.perf_counter()
+
+	vEX.stream.close()
+
+	return end - start
+
+
+# ###################################################################################################################
+def getBest(iRows):
+
+	# the database is read once, only the output is measured
+	vDB = S.SheetDB()
+	vContent, vValues = G.getContent(iRows, bCols, iDensity=1.0, iSpans=0, iFormula=0, iNumber=0)
+	S.setDB(vDB, vContent)
+
+	return min([ runJSON(vDB) for i in range(bRepeat) ])
+
+
+# ###################################################################################################################
+def getGrowth(iRows, iTimes):
+
+	import math
+
+	# least squares slope in log-log scale
+	vX = [ math.log(x) for x in iRows ]
+	vY = [ math.log(y) for y in iTimes ]
+	vMX = sum(vX) / len(vX)
+	vMY = sum(vY) / len(vY)
+
+	vUp = sum([ (x - vMX) * (y - vMY) for x, y in zip(vX, vY) ])
+	vDown = sum([ (x - vMX) ** 2 for x in vX ])
+
+	return vUp / vDown
+
+
+# ###################################################################################################################
+# MAIN
+# ###################################################################################################################
+
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import sheet2export as S
+import sheetgen as G
+
+# warm-up, the first run is slower because of imports and caches
+getBest(bRows[0])
+
+info = "\n\nrows\ttime [s]\tper row [ms]\n"
+times = []
+
+for rows in bRows:
+
+	t = getBest(rows)
+	times.append(t)
+
+	info += str(rows) + "\t" + "%.4f\t\t%.4f\n" % (t, t / rows * 1000)
+
+growth = getGrowth(bRows, times)
+info += "\ntime grows as rows ** %.2f " % growth
+
+if growth <= bMaxGrowth:
+	info += "( linear )\n"
+else:
+	info += "( NOT linear, limit " + str(bMaxGrowth) + " )\n"
+
+print(info)
+
+if growth > bMaxGrowth:
+	sys.exit(1)
+
+
+# ###################################################################################################################
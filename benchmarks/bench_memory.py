@@ -0,0 +1,65 @@
+# ###################################################################################################################
+'''
+
+Benchmark for memory used by sheet2export macro cell database
+
+Run it from command line, FreeCAD is not needed:
+python3 benchmarks/bench_memory.py
+
+It creates spreadsheet XML with all cells filled and aligned ( see sheetgen.py ) and measures with 
+tracemalloc the memory kept by setDB() after reading the spreadsheet, together with the cell values.
+
+'''
+# ###################################################################################################################
+
+
+import os, sys, gc, tracemalloc
+
+
+# ###################################################################################################################
+# Benchmark Settings ( CHANGE HERE IF NEEDED )
+# ###################################################################################################################
+
+
+# spreadsheet size
+bRows = 800
+bCols = 200
+
+
+# ###################################################################################################################
+# MAIN
+# ###################################################################################################################
+
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import sheet2export as S
+import sheetgen as G
+
+# get XML before measure, this is FreeCAD memory not the macro database
+vContent, vValues = G.getContent(bRows, bCols, iDensity=1.0, iSpans=0, iAlign=1.0, iBackground=0, 
+	iFormula=0, iNumber=0)
+
+gc.collect()
+tracemalloc.start()
+vStart = tracemalloc.get_traced_memory()[0]
+
+vDB = S.SheetDB()
+S.setDB(vDB, vContent)
+
+gc.collect()
+vEnd, vPeak = tracemalloc.get_traced_memory()
+tracemalloc.stop()
+
+vCells = bRows * bCols
+
+info = "\n\n"
+info += "cells: " + str(vCells) + "\n"
+info += "database: %.1f MB\n" % ((vEnd - vStart) / 1000000)
+info += "per cell: %.0f B\n" % ((vEnd - vStart) / vCells)
+info += "peak during setDB: %.1f MB\n" % ((vPeak - vStart) / 1000000)
+
+print(info)
+
+
+# ###################################################################################################################
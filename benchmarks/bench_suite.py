@@ -0,0 +1,247 @@
+# ###################################################################################################################
+'''
+
+Benchmark suite for sheet2export macro, FreeCAD is not needed
+
+Run it from command line:
+python3 benchmarks/bench_suite.py                    compare with baseline, if there is baseline
+python3 benchmarks/bench_suite.py --save             save results as new baseline
+python3 benchmarks/bench_suite.py --full             also the biggest spreadsheet 702 x 16384
+python3 benchmarks/bench_suite.py --sizes 10x10,800x200 --types csv,html
+
+For each spreadsheet size it creates synthetic spreadsheet ( see sheetgen.py ) and measures setDB() with
+FakeSheet.get() as FreeCAD API, then setOUTPUT() and saveToDisk() for each file type. The setOUTPUT() 
+is measured with rows streamed to the file, the same as macro default. The saveToDisk() is measured for 
+export without stream ( sStreamOUT = "no" ), so it is the write of the whole output to disk, not only 
+the file close. For each of them there is wall time, cells per second and peak memory from tracemalloc, 
+measured in separate run because tracemalloc slows the code down.
+
+The baseline is JSON file, by default benchmarks/baseline.json, it should be saved on the same machine
+where the suite runs later. The suite exits with code 1 if any time or peak memory is bigger than baseline
+more than given threshold, times shorter than bMinTime are not compared because they are mostly noise.
+
+'''
+# ###################################################################################################################
+
+
+import os, sys, gc, json, time, argparse, tempfile, tracemalloc
+
+
+# ###################################################################################################################
+# Benchmark Settings ( CHANGE HERE IF NEEDED )
+# ###################################################################################################################
+
+
+# spreadsheet sizes, columns x rows
+bSizes = ( (10, 10), (50, 100), (200, 800), (702, 1024) )
+
+# spreadsheet sizes added with --full
+bSizesFull = ( (702, 16384), )
+
+# file types to export
+bFileTypes = ( "csv", "html", "json", "md" )
+
+# allowed regression, 0.25 means 25% slower or bigger than baseline
+bThreshold = 0.25
+
+# times shorter than this are not compared with baseline
+bMinTime = 0.01
+
+# baseline file
+bBaseline = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+# ###################################################################################################################
+# Benchmark
+# ###################################################################################################################
+
+
+# ###################################################################################################################
+def getPeak(iFunction):
+
+	gc.collect()
+	tracemalloc.start()
+	vStart = tracemalloc.get_traced_memory()[0]
+
+	iFunction()
+
+	vPeak = tracemalloc.get_traced_memory()[1]
+	tracemalloc.stop()
+
+	return vPeak - vStart
+
+
+# ###################################################################################################################
+def getTime(iFunction):
+
+	gc.collect()
+	start = time.perf_counter()
+	iFunction()
+	end = time.perf_counter()
+
+	return end - start
+
+
+# ###################################################################################################################
+def setResult(iResults, iKey, iTime, iCells, iPeak):
+
+	vResult = dict()
+	vResult["time"] = round(iTime, 6)
+	vResult["cells_per_s"] = int(iCells / iTime) if iTime > 0 else 0
+	if iPeak != None:
+		vResult["peak_mb"] = round(iPeak / 1000000, 3)
+
+	iResults[iKey] = vResult
+
+	info = iKey.ljust(30) + "%10.4f s %14d cells/s" % (vResult["time"], vResult["cells_per_s"])
+	if iPeak != None:
+		info += "%10.1f MB" % vResult["peak_mb"]
+
+	print(info)
+
+
+# ###################################################################################################################
+def runSize(iResults, iCols, iRows, iFileTypes, iMemory, iPath):
+
+	vName = str(iCols) + "x" + str(iRows)
+	vContent, vValues = G.getContent(iRows, iCols)
+	vSheet = G.FakeSheet("bench " + vName, vContent, vValues)
+
+	# read spreadsheet the same way as macro
+	vDB = [ None ]
+
+	def runDB():
+		vDB[0] = S.SheetDB()
+		S.setDB(vDB[0], vSheet.cells.Content, vSheet.get)
+
+	vPeak = getPeak(runDB) if iMemory else None
+	vTime = getTime(runDB)
+	vStored = sum([ len(vRow.columns) for vRow in vDB[0].rows.values() ])
+	setResult(iResults, vName + "/setDB", vTime, vStored, vPeak)
+
+	# the output has all cells, also empty
+	vCells = vDB[0].maxR * vDB[0].maxC
+
+	for vFileType in iFileTypes:
+
+		vFile = S.getFilePath(iPath, "bench", vFileType)
+		vEX = [ None ]
+
+		# rows streamed to the file
+		def runOUTPUT():
+			vEX[0] = S.Export({ "sFileType": vFileType })
+			vEX[0].db = vDB[0]
+			S.openStream(vEX[0], vFile)
+			S.setOUTPUT(vEX[0])
+
+		# the whole output kept in memory for the save
+		def runMemory():
+			vEX[0] = S.Export({ "sFileType": vFileType, "sStreamOUT": "no" })
+			vEX[0].db = vDB[0]
+			S.setOUTPUT(vEX[0])
+
+		def runSave():
+			S.saveToDisk(vEX[0], vFile)
+
+		vPeakOUT = None
+		vPeakSave = None
+		if iMemory:
+			vPeakOUT = getPeak(runOUTPUT)
+			runSave()
+			runMemory()
+			vPeakSave = getPeak(runSave)
+
+		vTimeOUT = getTime(runOUTPUT)
+		runSave()
+		runMemory()
+		vTimeSave = getTime(runSave)
+
+		setResult(iResults, vName + "/" + vFileType + "/setOUTPUT", vTimeOUT, vCells, vPeakOUT)
+		setResult(iResults, vName + "/" + vFileType + "/saveToDisk", vTimeSave, vCells, vPeakSave)
+
+		os.remove(vFile)
+
+
+# ###################################################################################################################
+def getRegressions(iResults, iBaseline, iThreshold):
+
+	vErrors = []
+
+	for vKey in iResults:
+
+		if vKey not in iBaseline:
+			continue
+
+		vNew = iResults[vKey]
+		vOld = iBaseline[vKey]
+
+		if vOld["time"] >= bMinTime and vNew["time"] > vOld["time"] * (1 + iThreshold):
+			vErrors.append(vKey + " time: %.4f s, baseline: %.4f s" % (vNew["time"], vOld["time"]))
+
+		if "peak_mb" in vNew and "peak_mb" in vOld and vOld["peak_mb"] >= 1:
+			if vNew["peak_mb"] > vOld["peak_mb"] * (1 + iThreshold):
+				vErrors.append(vKey + " peak: %.1f MB, baseline: %.1f MB" % (vNew["peak_mb"], vOld["peak_mb"]))
+
+	return vErrors
+
+
+# ###################################################################################################################
+# MAIN
+# ###################################################################################################################
+
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import sheet2export as S
+import sheetgen as G
+
+vParser = argparse.ArgumentParser(description="Benchmark suite for sheet2export.")
+vParser.add_argument("--sizes", default=None, help="spreadsheet sizes, e.g. 10x10,200x800 ( columns x rows )")
+vParser.add_argument("--full", action="store_true", help="add the biggest spreadsheet sizes")
+vParser.add_argument("--types", default=",".join(bFileTypes), help="file types, default: %(default)s")
+vParser.add_argument("--threshold", type=float, default=bThreshold, help="allowed regression, default: %(default)s")
+vParser.add_argument("--baseline", default=bBaseline, help="baseline JSON file, default: %(default)s")
+vParser.add_argument("--save", action="store_true", help="save results as baseline")
+vParser.add_argument("--no-memory", action="store_true", help="skip peak memory runs")
+vArgs = vParser.parse_args()
+
+if vArgs.sizes != None:
+	vSizes = [ tuple([ int(x) for x in s.split("x") ]) for s in vArgs.sizes.split(",") ]
+else:
+	vSizes = list(bSizes)
+	if vArgs.full:
+		vSizes = vSizes + list(bSizesFull)
+
+vResults = dict()
+
+with tempfile.TemporaryDirectory() as vPath:
+	for vCols, vRows in vSizes:
+		runSize(vResults, vCols, vRows, vArgs.types.split(","), not vArgs.no_memory, vPath)
+
+if vArgs.save:
+
+	with open(vArgs.baseline, "w") as vFH:
+		json.dump(vResults, vFH, indent=1, sort_keys=True)
+
+	print("\nbaseline saved: " + vArgs.baseline)
+	sys.exit(0)
+
+if not os.path.isfile(vArgs.baseline):
+	print("\nno baseline to compare, use --save to create it")
+	sys.exit(0)
+
+with open(vArgs.baseline, "r") as vFH:
+	vBaseline = json.load(vFH)
+
+vErrors = getRegressions(vResults, vBaseline, vArgs.threshold)
+
+if len(vErrors) > 0:
+	print("\nREGRESSION, more than " + str(int(vArgs.threshold * 100)) + "% above baseline:")
+	for vError in vErrors:
+		print("  " + vError)
+	sys.exit(1)
+
+print("\nno regression, threshold " + str(int(vArgs.threshold * 100)) + "%")
+
+
+# ###################################################################################################################
@@ -0,0 +1,161 @@
+# ###################################################################################################################
+'''
+
+Synthetic spreadsheet for sheet2export benchmarks, FreeCAD is not needed
+
+getContent() creates the same XML as FreeCAD keeps in spreadsheet cells.Content property,
+with given size and share of cells with content, spans, alignments, background colors and formulas.
+
+FakeSheet is minimal stand-in for FreeCAD Spreadsheet::Sheet object, it has only what the macro uses:
+cells.Content, get(), Label and isDerivedFrom(). The get() returns values the same way as FreeCAD,
+int for integral numbers and float for other numbers, also for formulas, and text for text cells, 
+but there is no formula calculation, the values are generated together with the XML. Only cells 
+without content raise, like in FreeCAD.
+
+'''
+# ###################################################################################################################
+
+
+import os, sys, random
+from xml.sax.saxutils import quoteattr
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sheet2export import getKey
+
+
+# ###################################################################################################################
+# Generator Settings ( CHANGE HERE IF NEEDED )
+# ###################################################################################################################
+
+
+# share of cells with content for each row
+gDensity = 0.3
+
+# share of cells with colspan, and rowspan for some of them
+gSpans = 0.002
+
+# share of cells with alignment
+gAlign = 0.5
+
+# share of cells with background color
+gBackground = 0.05
+
+# share of cells with formula, the rest is text and numbers
+gFormula = 0.2
+
+# share of cells with number
+gNumber = 0.3
+
+
+# ###################################################################################################################
+# Generator
+# ###################################################################################################################
+
+
+# ###################################################################################################################
+def getContent(iRows, iCols, iSeed=1, iDensity=None, iSpans=None, iAlign=None, iBackground=None,
+		iFormula=None, iNumber=None):
+
+	# settings from generator settings if not given
+	vDensity = gDensity if iDensity == None else iDensity
+	vSpans = gSpans if iSpans == None else iSpans
+	vAlign = gAlign if iAlign == None else iAlign
+	vBackground = gBackground if iBackground == None else iBackground
+	vFormula = gFormula if iFormula == None else iFormula
+	vNumber = gNumber if iNumber == None else iNumber
+
+	vRandom = random.Random(iSeed)
+	vAlignments = ( "left|vcenter", "center|vcenter", "right|vcenter" )
+	vColors = ( "#ff0000ff", "#00ff00ff", "#d1d1d1ff" )
+
+	# values FreeCAD would return for numbers, formulas and text
+	vValues = dict()
+	vXML = [ '<Cells Count="0" xlink="1">\n<XLinks count="0">\n</XLinks>\n' ]
+	vCells = 0
+
+	# the same number of cells in each row, at random columns
+	vPerRow = max(1, int(round(iCols * vDensity)))
+
+	r = 1
+	while r <= iRows:
+
+		for c in sorted(vRandom.sample(range(1, iCols + 1), vPerRow)):
+
+			key = getKey(c, r)
+			vAttr = '<Cell address="' + key + '"'
+
+			x = vRandom.random()
+
+			if x < vFormula:
+				vValue = round(vRandom.uniform(0, 1000), 2)
+				vAttr += ' content="=' + getKey(vRandom.randint(1, iCols), vRandom.randint(1, iRows)) + '*2"'
+				vValues[key] = int(vValue) if vValue.is_integer() else vValue
+
+			elif x < vFormula + vNumber:
+				vValue = vRandom.randint(0, 100000)
+				vAttr += ' content="' + str(vValue) + '"'
+				vValues[key] = vValue
+
+			else:
+				vValue = "part " + str(vRandom.randint(1, 999)) + " & size"
+				vAttr += ' content=' + quoteattr(vValue)
+				vValues[key] = vValue
+
+			if vRandom.random() < vAlign:
+				vAttr += ' alignment="' + vRandom.choice(vAlignments) + '"'
+
+			if vRandom.random() < vBackground:
+				vAttr += ' backgroundColor="' + vRandom.choice(vColors) + '"'
+
+			if vRandom.random() < vSpans and c < iCols:
+				vAttr += ' colSpan="' + str(vRandom.randint(2, min(4, iCols - c + 1))) + '"'
+				if vRandom.random() < 0.5 and r < iRows:
+					vAttr += ' rowSpan="2"'
+
+			vXML.append(vAttr + ' />\n')
+			vCells = vCells + 1
+
+		r = r + 1
+
+	vXML.append('</Cells>\n')
+	vXML[0] = vXML[0].replace('Count="0"', 'Count="' + str(vCells) + '"')
+
+	return "".join(vXML), vValues
+
+
+# ###################################################################################################################
+# FreeCAD stand-in
+# ###################################################################################################################
+
+
+# ###################################################################################################################
+class FakeCells:
+
+	def __init__(self, iContent):
+		self.Content = iContent
+
+
+# ###################################################################################################################
+class FakeSheet:
+
+	def __init__(self, iLabel, iContent, iValues):
+		self.Label = iLabel
+		self.Name = iLabel
+		self.cells = FakeCells(iContent)
+		self.values = iValues
+		self.calls = 0
+
+	def isDerivedFrom(self, iType):
+		return iType in ( "Spreadsheet::Sheet", "App::DocumentObject" )
+
+	def get(self, iKey):
+
+		# FreeCAD raises for cells without content
+		self.calls = self.calls + 1
+		if iKey not in self.values:
+			raise ValueError("Invalid cell address or cell is empty: " + str(iKey))
+
+		return self.values[iKey]
+
+
+# ###################################################################################################################
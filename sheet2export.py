@@ -12,10 +12,15 @@ https://github.com/dprojects/Woodworking
 # ###################################################################################################################
 
 
-import FreeCAD, FreeCADGui, Draft, Spreadsheet
-from PySide import QtGui, QtCore
-
-translate = FreeCAD.Qt.translate
+# the export engine works also without FreeCAD, e.g. in worker processes or tests, 
+# so FreeCAD is optional here and GUI modules are imported only when needed
+try:
+	import FreeCAD
+	translate = FreeCAD.Qt.translate
+except ImportError:
+	FreeCAD = None
+	def translate(iContext, iText):
+		return iText
 
 
 # ###################################################################################################################
@@ -28,6 +33,10 @@ translate = FreeCAD.Qt.translate
 # "html" - HyperText Markup Language (.html file)
 # "json" - JavaScript Object Notation (.json file), see e.g. json2table.com
 # "md" - MarkDown (.md file), see e.g. dillinger.io
+# "sqlite" - SQLite database (.sqlite file), all spreadsheets of document in one file, in cells table
+# "npz" - NumPy arrays (.npz file), numeric columns as number arrays, needs NumPy
+# "xlsx" - Excel workbook (.xlsx file), with alignment, bold, background colors and merged cells
+# or list of file types to export each spreadsheet to all of them at once, e.g. [ "csv", "html" ]
 sFileType = "html"
 
 # Export type:
@@ -47,18 +56,92 @@ sFilePath = "./"
 # ###################################################################################################################
 
 
-# Empty cell content:
-if sFileType == "html":
+# Empty cell content, "&nbsp;" is used only for html and other file types get empty string:
+if "html" in sFileType:
 	sEmptyCell = "&nbsp;"
 else:
 	sEmptyCell = ""
 
-# Separator for CSV:
+# Separator for CSV, one character:
 sSepCSV = ","
 
+# Quoting for CSV:
+# "minimal" - quote only cells with separator, quote character or new line
+# "all" - quote all cells
+# "none" - no quotes, separator and quote character in cell are escaped with backslash
+sQuoteCSV = "minimal"
+
+# Line end for CSV, written as given on each system, e.g. "\n" or "\r\n":
+sLineCSV = "\n"
+
 # custom CSS rules
 sCustomCSS ="border-bottom:1px dotted #000000;"
 
+# CSS for html:
+# "yes" - write CSS classes in <STYLE> block before the table and only class name for each cell, smaller file
+# "no" - write inline style for each cell, easy to copy the table to the post or other web page
+sCSSclass = "no"
+
+# Output writing:
+# "yes" - write each row to the file as soon as it is ready, only one row is kept in memory
+# "no" - build the whole file content in memory and save it at the end
+sStreamOUT = "yes"
+
+# Compression of exported file, the file gets extra extension, e.g. .csv.gz:
+# "no" - plain text file
+# "gz" - gzip
+# "bz2" - bzip2
+# "xz" - xz (lzma)
+# the npz file is compressed by NumPy for any of them without extra extension, sqlite is not compressed 
+# and xlsx is always zip file
+sCompress = "no"
+
+# Empty cells compaction:
+# "yes" - html gets one cell with colspan for empty cells next to each other, csv and md get no 
+#         empty cells at the end of row and no empty rows at the end of table
+# "no" - write each empty cell
+sCompact = "no"
+
+# Parallel export for "a" export type:
+# 1 - export spreadsheets one by one in FreeCAD process
+# 0 - export spreadsheets in worker processes, one for each CPU core
+# or set Your custom number of worker processes
+sJobs = 1
+
+# Background export:
+# "yes" - spreadsheet data is read in FreeCAD and files are exported in background thread, 
+#         so FreeCAD can be used during export, the summary is shown when all files are exported
+# "no" - wait for the export
+sBackground = "no"
+
+# Watch mode in seconds:
+# the document is watched after the export and changed spreadsheets are exported again in background, 
+# the export starts when there is no change for this time, so recompute with many changes gives one export, 
+# run the macro again with 0 or cancel the macro dialog to stop watching
+# 0 - no watch
+sWatch = 0
+
+# Export cache:
+# "yes" - skip spreadsheets not changed since last export, the list of exported files is kept in 
+#         ".sheet2export.json" file in export file path
+# "no" - export all spreadsheets
+sCache = "no"
+
+# Export statistics:
+# "yes" - show time of each export phase and cell counters for each spreadsheet in report view
+# "json" - the same and also save them to "sheet2export.stats.json" file in export file path
+# "no" - no statistics
+sStats = "no"
+
+# Export time budget in seconds:
+# if the export time estimated from earlier exports is longer, there is question to wait or skip, 
+# 0 - never ask
+sBudget = 10
+
+# Progress update interval in seconds:
+# the progress dialog or text in report view is updated at most once for this time
+sProgress = 0.25
+
 # show Qt boxes
 # "yes" - to show
 # "no" - to hide
@@ -70,24 +153,45 @@ sQT = "yes"
 # ###################################################################################################################
 
 
-# set reference point to Active Document
-gAD = FreeCAD.activeDocument()
+# set reference point to Active Document, set when run as macro
+gAD = None
 
-# get all objects from 3D model
-gOBs = gAD.Objects
+# get all objects from 3D model, set when run as macro
+gOBs = []
 
 # init output file name
 gFile = "result" # will be overwritten later
 
 # init spreadsheet object
-gSheet = gAD # will be overwritten later
-
-# init output result
-gOUT = ""
+gSheet = None # will be overwritten later
 
 # exported files names
 gExpFilesN = ""
 
+# not changed files names, skipped with export cache
+gSkipFilesN = ""
+
+# spreadsheets with formulas, exported always even with export cache
+gFormulaN = ""
+
+# export cache, loaded only if used
+gCache = None
+
+# export statistics for each spreadsheet, only if used
+gStats = []
+
+# export speed measured on earlier exports, loaded only if used
+gModel = None
+
+# file types written directly from database, not row by row as text
+gDBTypes = ( "sqlite", "npz" )
+
+# file types with all spreadsheets of document in one file
+gDocTypes = ( "sqlite", )
+
+# file types with own binary format, they are not written to given stream and have no compression extension
+gBinTypes = ( "sqlite", "npz", "xlsx" )
+
 # console print separator
 gSepC = "\n ================================================================ \n"
 
@@ -100,23 +204,222 @@ gExecute = "yes"
 # ###################################################################################################################
 
 
-# cell properties
-dbCPC = dict() # content
-dbCPA = dict() # alignment
-dbCPS = dict() # style
-dbCPB = dict() # background
-dbCPRS = dict() # row span
-dbCPCS = dict() # column span
-
-# max
-dbMaxR = 0 # row
-dbMaxC = 0 # column
-
 # spreadsheet key
 dbSKV = dict() # value for letters
 dbSKL = dict() # letters for value
 
 
+# ###################################################################################################################
+class CellProperties:
+
+	# one object for each decoration found in spreadsheet, cells only refer to it
+	__slots__ = ("alignment", "style", "background", "rowSpan", "colSpan")
+
+	def __init__(self, iAlignment, iStyle, iBackground, iRowSpan, iColSpan):
+		self.alignment = iAlignment
+		self.style = iStyle
+		self.background = iBackground
+		self.rowSpan = iRowSpan # int
+		self.colSpan = iColSpan # int
+
+
+# ###################################################################################################################
+class RowCells:
+
+	# parallel arrays for cells in the same row, there can be thousands of cells 
+	# so there is no object for each cell, only column number and two references
+	__slots__ = ("columns", "values", "props", "ordered")
+
+	def __init__(self):
+		from array import array
+		self.columns = array("H") # column numbers
+		self.values = [] # None if FreeCAD has no value for the cell
+		self.props = [] # CellProperties
+		self.ordered = True
+
+	def add(self, iC, iValue, iCP):
+		if len(self.columns) > 0 and iC < self.columns[-1]:
+			self.ordered = False
+		self.columns.append(iC)
+		self.values.append(iValue)
+		self.props.append(iCP)
+
+	def sort(self):
+
+		# FreeCAD writes cells row by row, so this is rarely needed
+		if self.ordered:
+			return
+
+		from array import array
+		vOrder = sorted(range(len(self.columns)), key=self.columns.__getitem__)
+		self.columns = array("H", [ self.columns[i] for i in vOrder ])
+		self.values = [ self.values[i] for i in vOrder ]
+		self.props = [ self.props[i] for i in vOrder ]
+		self.ordered = True
+
+
+# ###################################################################################################################
+class SheetDB:
+
+	# database for one spreadsheet, new object for each exported spreadsheet
+	def __init__(self):
+
+		# spreadsheet key databases are the same for all spreadsheets
+		if len(dbSKL) == 0:
+			setSK()
+
+		self.rows = dict() # stored cells for each row, rows[row] gives RowCells
+		self.props = dict() # cell properties shared by all cells with the same decoration
+		self.covered = dict() # cells covered by merged cells, covered[row][column] is 1 for covered cell
+		self.maxR = 0 # max row
+		self.maxC = 0 # max column
+		self.apiCalls = 0 # value getter calls made for current spreadsheet
+		self.apiSkip = 0 # value getter calls avoided for current spreadsheet
+		self.stats = None # Stats, set only if statistics are on
+
+
+# ###################################################################################################################
+class Export:
+
+	# settings and output state for one export, the module settings are used as default, 
+	# so the macro works as before and other code can export with its own options
+	def __init__(self, iOptions=None):
+
+		self.sFileType = getFileTypes()[0]
+		self.sEmptyCell = sEmptyCell
+		self.sSepCSV = sSepCSV
+		self.sQuoteCSV = sQuoteCSV
+		self.sLineCSV = sLineCSV
+		self.sCustomCSS = sCustomCSS
+		self.sCSSclass = sCSSclass
+		self.sStreamOUT = sStreamOUT
+		self.sCompact = sCompact
+		self.sCompress = sCompress
+
+		if iOptions == None:
+			iOptions = dict()
+
+		for vKey in iOptions:
+			if not hasattr(self, vKey):
+				raise ValueError("unknown export option: " + str(vKey))
+			setattr(self, vKey, iOptions[vKey])
+
+		# empty cell content depends on file type
+		if "sFileType" in iOptions and "sEmptyCell" not in iOptions:
+			if self.sFileType == "html":
+				self.sEmptyCell = "&nbsp;"
+			else:
+				self.sEmptyCell = ""
+
+		self.db = SheetDB()
+		self.label = "" # spreadsheet label for file types with all spreadsheets in one file
+		self.out = [] # output parts, with streaming it keeps only the current row
+		self.stream = None # output stream, any object with write() method
+		self.file = "" # file opened for the output stream, empty if the stream was given from outside
+		self.sepR = "" # JSON separators, empty before the first row and the first cell in row
+		self.sepC = ""
+		self.progress = None # called with row number for each row, if set, "no" returned cancels the export
+		self.c = 1 # next column to write in current row
+		self.value = None # database value of current cell, for file types with number cells, e.g. xlsx
+		self.covered = None # cells covered by merged cells in current row, only for html
+		self.pendC = 0 # empty cells and empty rows not written yet with compaction
+		self.pendR = 0
+		self.htmlTD = dict() # html cell open tag for each cell properties
+		self.htmlClass = dict() # CSS class name for each decoration
+		self.csv = None # csv.writer for CSV file type, it writes to output parts
+		self.row = [] # CSV cells for current row
+		self.zip = None # XLSX zip file
+		self.xlsxStrings = dict() # XLSX shared string index for each text
+		self.xlsxStyles = dict() # XLSX cellXfs index for each cell properties
+		self.xlsxXfs = dict() # XLSX cellXfs index for each font, fill and alignment
+		self.xlsxMerge = [] # XLSX merged cells
+		self.empty = 0 # empty cells written
+		self.chars = 0 # characters written, only with statistics
+		self.timeWrite = 0.0 # time of writing to stream or file, only with statistics
+
+
+# ###################################################################################################################
+class Stats:
+
+	# time of each export phase and counters for one spreadsheet, the time is measured 
+	# only if this object is set for the database, so without statistics there is no extra cost
+	def __init__(self, iLabel=""):
+
+		self.label = iLabel
+		self.parse = 0.0 # XML parse and database write, without value getter calls
+		self.get = 0.0 # value getter calls, e.g. gSheet.get()
+		self.format = 0.0 # output for all file types, without write
+		self.cells = 0 # stored cells with value
+		self.apiCalls = 0
+		self.apiSkip = 0
+		self.files = [] # counters for each exported file
+
+
+# ###################################################################################################################
+class Progress:
+
+	# progress of one spreadsheet export, called for each row but shown only once for sProgress seconds, 
+	# with Qt there is dialog with cancel button, without Qt there is text in report view
+	def __init__(self, iLabel, iMaxR):
+
+		import time
+
+		self.label = str(iLabel)
+		self.maxR = iMaxR
+		self.clock = time.perf_counter
+		self.start = self.clock()
+		self.next = self.start + sProgress
+		self.dialog = None
+
+		if sQT == "yes":
+
+			from PySide import QtGui, QtCore
+
+			self.dialog = QtGui.QProgressDialog(self.label, translate('sheet2export', 'Cancel'), 0, iMaxR)
+			self.dialog.setWindowTitle(translate('sheet2export', 'sheet2export'))
+			self.dialog.setWindowModality(QtCore.Qt.ApplicationModal)
+			self.dialog.setMinimumDuration(1000)
+
+	def update(self, iR):
+
+		vNow = self.clock()
+		if vNow < self.next:
+			return "yes"
+
+		self.next = vNow + sProgress
+
+		# rows before the current row are done
+		vDone = iR - 1
+		vLeft = 0
+		if vDone > 0:
+			vLeft = int((vNow - self.start) / vDone * (self.maxR - vDone))
+
+		if self.dialog == None:
+			printMsg(" " + str(int(100 * vDone / self.maxR)) + "%")
+			return "yes"
+
+		from PySide import QtGui
+
+		info = self.label + "\n\n"
+		info += translate('sheet2export', 'rows') + ": " + str(vDone) + " / " + str(self.maxR) + ", "
+		info += translate('sheet2export', 'time left') + ": " + str(vLeft) + " s"
+
+		self.dialog.setLabelText(info)
+		self.dialog.setValue(vDone)
+		QtGui.QApplication.processEvents()
+
+		if self.dialog.wasCanceled():
+			return "no"
+
+		return "yes"
+
+	def close(self):
+
+		if self.dialog != None:
+			self.dialog.close()
+			self.dialog = None
+
+
 # ###################################################################################################################
 # Support for Qt GUI
 # ###################################################################################################################
@@ -127,6 +430,9 @@ def showQtMain():
 
 	global gExecute
 
+	import FreeCADGui
+	from PySide import QtGui, QtCore
+
 	# ############################################################################
 	# Qt Main Class
 	# ############################################################################
@@ -184,6 +490,18 @@ def showQtMain():
 			
 			self.fPathB = QtGui.QPushButton("...", self)
 			self.fPathB.clicked.connect(self.loadCustomDir)
+
+			# ############################################################################
+			# compression
+			# ############################################################################
+
+			self.compressL = QtGui.QLabel(translate('sheet2export', 'Compression:'), self)
+
+			self.compressOlist = ("no", "gz", "bz2", "xz")
+			self.compressO = QtGui.QComboBox(self)
+			self.compressO.addItems(self.compressOlist)
+			self.compressO.setCurrentIndex(self.compressOlist.index(sCompress))
+			self.compressO.setFixedSize(80, 20)
 			
 			# ############################################################################
 			# file type
@@ -191,14 +509,15 @@ def showQtMain():
 			
 			self.fileTypeL = QtGui.QLabel(translate('sheet2export', 'Export file type:'), self)
 			
-			self.fileTypeOlist = ("csv","html","json","md")
-			self.fileTypeO = QtGui.QComboBox(self)
-			self.fileTypeO.addItems(self.fileTypeOlist)
-			self.fileTypeO.setCurrentIndex(self.fileTypeOlist.index("html"))
-			self.fileTypeO.textActivated[str].connect(self.setFileType)
-			self.fileTypeO.setFixedSize(80, 20)
+			# more file types can be selected, the spreadsheet is read once for all
+			self.fileTypeOlist = ("csv","html","json","md","sqlite","npz","xlsx")
+			self.fileTypeO = dict()
+			for t in self.fileTypeOlist:
+				self.fileTypeO[t] = QtGui.QCheckBox(t, self)
+				self.fileTypeO[t].setChecked(t in getFileTypes())
+				self.fileTypeO[t].stateChanged.connect(self.setFileType)
 			
-			self.fileTypeOIS = QtGui.QLabel(translate('sheet2export', 'HyperText Markup Language (.html file)'), self)
+			self.fileTypeOIS = QtGui.QLabel("", self)
 			
 			# ############################################################################
 			# empty cell
@@ -208,6 +527,9 @@ def showQtMain():
 			
 			self.emptyCellTi = QtGui.QLineEdit(self)
 			self.emptyCellTi.setText(str(sEmptyCell))
+
+			self.compactC = QtGui.QCheckBox(translate('sheet2export', 'Compact empty cells'), self)
+			self.compactC.setChecked(sCompact == "yes")
 			
 			# ############################################################################
 			# CSV separator
@@ -217,6 +539,8 @@ def showQtMain():
 			
 			self.csvSTi = QtGui.QLineEdit(self)
 			self.csvSTi.setText(str(sSepCSV))
+			self.csvSTi.setMaxLength(1)
+			self.csvSTi.setPlaceholderText(",")
 			
 			# ############################################################################
 			# custom CSS rules
@@ -240,6 +564,9 @@ def showQtMain():
 			self.customCSSti = QtGui.QLineEdit(self)
 			self.customCSSti.setText(str(sCustomCSS))
 			self.customCSSti.setFixedWidth(460)
+			# CSS classes
+			self.customCSScc = QtGui.QCheckBox(translate('sheet2export', 'Step 3. Write CSS classes instead of inline style for each cell'), self)
+			self.customCSScc.setChecked(sCSSclass == "yes")
 
 			# ############################################################################
 			# buttons
@@ -265,21 +592,31 @@ def showQtMain():
 			self.body2.addWidget(self.fPathL)
 			self.body2.addWidget(self.fPathTi)
 			self.body2.addWidget(self.fPathB)
+			self.body2a = QtGui.QHBoxLayout()
+			self.body2a.setAlignment(QtGui.Qt.AlignLeft)
+			self.body2a.addWidget(self.compressL)
+			self.body2a.addWidget(self.compressO)
 			self.body3 = QtGui.QHBoxLayout()
 			self.body3.setAlignment(QtGui.Qt.AlignLeft)
 			self.body3.addWidget(self.fileTypeL)
-			self.body3.addWidget(self.fileTypeO)
-			self.body3.addWidget(self.fileTypeOIS)
+			for t in self.fileTypeOlist:
+				self.body3.addWidget(self.fileTypeO[t])
+			self.body3a = QtGui.QHBoxLayout()
+			self.body3a.setAlignment(QtGui.Qt.AlignLeft)
+			self.body3a.addWidget(self.fileTypeOIS)
 			self.lay1 = QtGui.QVBoxLayout()
 			self.lay1.addLayout(self.body1)
 			self.lay1.addLayout(self.body2)
+			self.lay1.addLayout(self.body2a)
 			self.lay1.addLayout(self.body3)
+			self.lay1.addLayout(self.body3a)
 			self.groupBody1 = QtGui.QGroupBox(None, self)
 			self.groupBody1.setLayout(self.lay1)
 			
 			self.body4 = QtGui.QHBoxLayout()
 			self.body4.addWidget(self.emptyCellL)
 			self.body4.addWidget(self.emptyCellTi)
+			self.body4.addWidget(self.compactC)
 			self.body5 = QtGui.QHBoxLayout()
 			self.body5.addWidget(self.csvSL)
 			self.body5.addWidget(self.csvSTi)
@@ -289,6 +626,7 @@ def showQtMain():
 			self.body7 = QtGui.QVBoxLayout()
 			self.body7.addWidget(self.customCSStil)
 			self.body7.addWidget(self.customCSSti)
+			self.body7.addWidget(self.customCSScc)
 			self.lay2 = QtGui.QVBoxLayout()
 			self.lay2.addLayout(self.body4)
 			self.lay2.addLayout(self.body5)
@@ -310,9 +648,8 @@ def showQtMain():
 			self.layout.addLayout(self.body8)
 			self.setLayout(self.layout)
 
-			# hide
-			self.csvSL.hide()
-			self.csvSTi.hide()
+			# show options only for selected file types
+			self.setFileType()
 
 			# ############################################################################
 			# show
@@ -343,50 +680,46 @@ def showQtMain():
 			sFilePath = str(QtGui.QFileDialog.getExistingDirectory())
 			self.fPathTi.setText(sFilePath)
 		
-		def setFileType(self, selectedText):
+		def setFileType(self, selectedState=None):
 			global sFileType
 
-			sFileType = str(selectedText)
+			sFileType = [ t for t in self.fileTypeOlist if self.fileTypeO[t].isChecked() ]
 
-			if selectedText == "csv":
-				self.fileTypeOIS.setText(translate('sheet2export', 'Comma-separated values ( .csv file )'))
-				self.customCSSbl.hide()
-				self.customCSSbo.hide()
-				self.customCSStil.hide()
-				self.customCSSti.hide()
+			info = {
+				"csv": translate('sheet2export', 'Comma-separated values ( .csv file )'),
+				"html": translate('sheet2export', 'HyperText Markup Language ( .html file )'),
+				"json": translate('sheet2export', 'JavaScript Object Notation ( .json file )'),
+				"md": translate('sheet2export', 'MarkDown ( .md file )'),
+				"sqlite": translate('sheet2export', 'SQLite database, one for document ( .sqlite file )'),
+				"npz": translate('sheet2export', 'NumPy arrays ( .npz file )'),
+				"xlsx": translate('sheet2export', 'Excel workbook ( .xlsx file )')
+			}
+			self.fileTypeOIS.setText("\n".join([ info[t] for t in sFileType ]))
+
+			if "csv" in sFileType:
 				self.csvSL.show()
 				self.csvSTi.show()
-				self.emptyCellTi.setText("")
-
-			if selectedText == "html":
-				self.fileTypeOIS.setText(translate('sheet2export', 'HyperText Markup Language ( .html file )'))
+			else:
 				self.csvSL.hide()
 				self.csvSTi.hide()
+
+			if "html" in sFileType:
 				self.customCSSbl.show()
 				self.customCSSbo.show()
 				self.customCSStil.show()
 				self.customCSSti.show()
+				self.customCSScc.show()
 				self.emptyCellTi.setText(str(sEmptyCell))
-
-			if selectedText == "json":
-				self.fileTypeOIS.setText(translate('sheet2export', 'JavaScript Object Notation ( .json file )'))
-				self.csvSL.hide()
-				self.csvSTi.hide()
+			else:
 				self.customCSSbl.hide()
 				self.customCSSbo.hide()
 				self.customCSStil.hide()
 				self.customCSSti.hide()
+				self.customCSScc.hide()
 				self.emptyCellTi.setText("")
 
-			if selectedText == "md":
-				self.fileTypeOIS.setText(translate('sheet2export', 'MarkDown ( .md file )'))
-				self.csvSL.hide()
-				self.csvSTi.hide()
-				self.customCSSbl.hide()
-				self.customCSSbo.hide()
-				self.customCSStil.hide()
-				self.customCSSti.hide()
-				self.emptyCellTi.setText("")
+			# at least one file type is needed
+			self.okButton.setEnabled(len(sFileType) > 0)
 
 		def setEType(self, selectedText):
 			global sExportType
@@ -442,12 +775,20 @@ def showQtMain():
 	
 	if form.result == userOK:
 		global sCustomCSS
+		global sCSSclass
+		global sCompact
+		global sCompress
 		global sSepCSV
 		global sEmptyCell
 		global sFilePath
 
 		sCustomCSS = form.customCSSti.text()
+		sCSSclass = "yes" if form.customCSScc.isChecked() else "no"
+		sCompact = "yes" if form.compactC.isChecked() else "no"
+		sCompress = form.compressO.currentText()
 		sSepCSV = form.csvSTi.text()
+		if sSepCSV == "":
+			sSepCSV = ","
 		sEmptyCell = form.emptyCellTi.text()
 		sFilePath = form.fPathTi.text()
 
@@ -457,17 +798,30 @@ def showQtMain():
 # ###################################################################################################################
 
 
+# ###################################################################################################################
+def printMsg(iText):
+
+	# FreeCAD report view or console without FreeCAD
+	if FreeCAD != None:
+		FreeCAD.Console.PrintMessage(iText)
+	else:
+		import sys
+		sys.stdout.write(iText)
+		sys.stdout.flush()
+
+
 # ###################################################################################################################
 def showInfo(iText):
 
 	if sQT == "yes":
 
+		from PySide import QtGui
 		QtGui.QMessageBox.information(None, translate('sheet2export', 'sheet2export'), str(iText))
 
 	else:
-		FreeCAD.Console.PrintMessage(gSepC)
-		FreeCAD.Console.PrintMessage(str(iText))
-		FreeCAD.Console.PrintMessage(gSepC)
+		printMsg(gSepC)
+		printMsg(str(iText))
+		printMsg(gSepC)
 	
 	return 0
 
@@ -475,21 +829,21 @@ def showInfo(iText):
 # ###################################################################################################################
 def showError(iObj, iPlace, iError):
 
-	FreeCAD.Console.PrintMessage(gSepC)
+	printMsg(gSepC)
 	
 	try:
-		FreeCAD.Console.PrintMessage("ERROR: ")
-		FreeCAD.Console.PrintMessage(" | ")
-		FreeCAD.Console.PrintMessage(str(iObj.Label))
-		FreeCAD.Console.PrintMessage(" | ")
-		FreeCAD.Console.PrintMessage(str(iPlace))
-		FreeCAD.Console.PrintMessage(" | ")
-		FreeCAD.Console.PrintMessage(str(iError))
+		printMsg("ERROR: ")
+		printMsg(" | ")
+		printMsg(str(iObj.Label))
+		printMsg(" | ")
+		printMsg(str(iPlace))
+		printMsg(" | ")
+		printMsg(str(iError))
 		
 	except:
-		FreeCAD.Console.PrintMessage("FATAL ERROR, or even worse :-)")
+		printMsg("FATAL ERROR, or even worse :-)")
 		
-	FreeCAD.Console.PrintMessage(gSepC)
+	printMsg(gSepC)
 	
 	return 0
 
@@ -500,47 +854,82 @@ def showError(iObj, iPlace, iError):
 
 
 # ###################################################################################################################
-def CSVbegin():
-	global gOUT
+def CSVbegin(iEX):
+
+	import csv, types
+
+	# quoting and escaping is done by csv module, for each row at once, 
+	# the writer writes to output parts, so it works with and without output stream
+	vQuote = { "minimal": csv.QUOTE_MINIMAL, "all": csv.QUOTE_ALL, "none": csv.QUOTE_NONE }
+
+	# escape character is needed only without quotes
+	vEscape = None
+	if iEX.sQuoteCSV == "none":
+		vEscape = "\\"
+
+	iEX.csv = csv.writer(types.SimpleNamespace(write=iEX.out.append), 
+		delimiter=iEX.sSepCSV, quoting=vQuote[iEX.sQuoteCSV], escapechar=vEscape, lineterminator=iEX.sLineCSV)
+
+
+# ###################################################################################################################
+def CSVend(iEX):
 
-	gOUT += ''
+	iEX.csv = None
 
 
 # ###################################################################################################################
-def CSVend():
-	global gOUT
+def CSVrowOpen(iEX):
 
-	gOUT += ''
+	iEX.row = []
+	iEX.pendC = 0
 
 
 # ###################################################################################################################
-def CSVrowOpen():
-	global gOUT
+def CSVrowClose(iEX):
 
-	gOUT += ''
+	# row without content is written later only if there is row with content after it
+	if iEX.sCompact == "yes" and len(iEX.row) == 0:
+		iEX.pendR = iEX.pendR + 1
+		return
+
+	iEX.csv.writerow(iEX.row)
 
 
 # ###################################################################################################################
-def CSVrowClose():
-	global gOUT
+def CSVempty(iEX, iCP, iC, iR):
+
+	if iEX.sCompact == "yes":
+		iEX.pendC = iEX.pendC + 1
+		return
 
-	gOUT += '\n'
+	iEX.row.append(iEX.sEmptyCell)
 
 
 # ###################################################################################################################
-def CSVempty(iKey, iC, iR):
-	global gOUT
+def CSVemptyRun(iEX, iC, iN, iR):
 
-	gOUT += str(sEmptyCell)
-	gOUT += sSepCSV
+	if iEX.sCompact == "yes":
+		iEX.pendC = iEX.pendC + iN
+		return
+
+	iEX.row.extend([ iEX.sEmptyCell ] * iN)
 
 
 # ###################################################################################################################
-def CSVcell(iKey, iCell, iC, iR):
-	global gOUT
+def CSVcell(iEX, iCP, iCell, iC, iR):
+
+	# empty rows and empty cells are written only before cell with content, 
+	# so there are no empty cells at the end of row and no empty rows at the end
+	if iEX.sCompact == "yes":
+
+		if len(iEX.row) == 0:
+			iEX.csv.writerows([ [] ] * iEX.pendR)
+			iEX.pendR = 0
+
+		iEX.row.extend([ iEX.sEmptyCell ] * iEX.pendC)
+		iEX.pendC = 0
 
-	gOUT += str(iCell)
-	gOUT += sSepCSV
+	iEX.row.append(iCell)
 
 
 # ###################################################################################################################
@@ -549,119 +938,138 @@ def CSVcell(iKey, iCell, iC, iR):
 
 
 # ###################################################################################################################
-def HTMLbegin():
-	global gOUT
+def HTMLbegin(iEX):
 
 	# there is no need to add html document header here because if the file is html table 
 	# only the file is correctly parsed by browser, moreover this is easier to copy the 
 	# file content and place it to the post or other web page
-	gOUT += '<TABLE>\n'
+	if iEX.sCSSclass != "yes":
+		iEX.out.append('<TABLE>\n')
+		return
+
+	# class for each decoration used in spreadsheet, the table class keeps 
+	# the rules only for this table if the file is placed in other web page
+	iEX.out.append('<STYLE>\n')
+	iEX.out.append('.sheet2export TD {' + str(iEX.sCustomCSS) + '}\n')
+
+	for vCP in iEX.db.props.values():
+
+		vStyle = getHTMLstyle(vCP)
+		if vStyle == "" or vStyle in iEX.htmlClass:
+			continue
+
+		iEX.htmlClass[vStyle] = "c" + str(len(iEX.htmlClass) + 1)
+		iEX.out.append('.sheet2export .' + iEX.htmlClass[vStyle] + ' {' + vStyle + '}\n')
+
+	iEX.out.append('</STYLE>\n')
+	iEX.out.append('<TABLE class="sheet2export">\n')
 
 
 # ###################################################################################################################
-def HTMLend():
-	global gOUT
+def HTMLend(iEX):
 
-	gOUT += "</TABLE>"
+	iEX.out.append("</TABLE>")
 
 
 # ###################################################################################################################
-def HTMLrowOpen():
-	global gOUT
+def HTMLrowOpen(iEX):
 
-	gOUT += " <TR>\n"
+	iEX.out.append(" <TR>\n")
 	
 
 # ###################################################################################################################
-def HTMLrowClose():
-	global gOUT
+def HTMLrowClose(iEX):
 
-	gOUT += " </TR>\n"
+	iEX.out.append(" </TR>\n")
 	
 
 # ###################################################################################################################
-def HTMLempty(iKey, iC, iR):
-	global gOUT
+def HTMLempty(iEX, iCP, iC, iR):
 
-	gOUT += '  <TD '
+	iEX.out.append(getHTMLopen(iEX, iCP, iC) + str(iEX.sEmptyCell) + "</TD>\n")
 
-	try:
-		gOUT += 'colspan="'+str(dbCPCS[iKey]) + '" '
-	except:
-		gOUT += ''
 
-	try:
-		gOUT += 'rowspan="'+str(dbCPRS[iKey]) + '" '
-	except:
-		gOUT += ''
+# ###################################################################################################################
+def HTMLemptyRun(iEX, iC, iN, iR):
 
-	
-	gOUT += 'style=' 
-	gOUT += '"'
-	gOUT += str(sCustomCSS)
-	
-	try:
-		gOUT += 'text-align:'+str(dbCPA[iKey]).split("|")[0] + ';'
-	except:
-		gOUT += ''
-	
-	try:
-		gOUT += 'background-color:'+str(dbCPB[iKey]) + ';'
-	except:
-		gOUT += ''
-	
-	try:
-		gOUT += 'font-weight:'+str(dbCPS[iKey]) + ';'
-	except:
-		gOUT += ''
-	
+	# one cell for all empty cells looks the same in browser
+	if iEX.sCompact == "yes" and iN > 1:
+		if iEX.sCSSclass == "yes":
+			iEX.out.append('  <TD colspan="' + str(iN) + '">' + str(iEX.sEmptyCell) + "</TD>\n")
+		else:
+			iEX.out.append('  <TD colspan="' + str(iN) + '" style="' + str(iEX.sCustomCSS) + '">' + str(iEX.sEmptyCell) + "</TD>\n")
+		return
 
-	gOUT += '"'
-	gOUT += '>'
-	gOUT += str(sEmptyCell)
-	gOUT += "</TD>\n"
+	# the same as HTMLempty for cell without any decoration
+	if iEX.sCSSclass == "yes":
+		iEX.out.append(('  <TD>' + str(iEX.sEmptyCell) + "</TD>\n") * iN)
+	else:
+		iEX.out.append(('  <TD style="' + str(iEX.sCustomCSS) + '">' + str(iEX.sEmptyCell) + "</TD>\n") * iN)
 
 
 # ###################################################################################################################
-def HTMLcell(iKey, iCell, iC, iR):
-	global gOUT
+def HTMLcell(iEX, iCP, iCell, iC, iR):
 
-	gOUT += '  <TD '
+	iEX.out.append(getHTMLopen(iEX, iCP, iC) + iCell + "</TD>\n")
 
-	try:
-		gOUT += 'colspan="'+str(dbCPCS[iKey]) + '" '
-	except:
-		gOUT += ''
 
-	try:
-		gOUT += 'rowspan="'+str(dbCPRS[iKey]) + '" '
-	except:
-		gOUT += ''
+# ###################################################################################################################
+def getHTMLstyle(iCP):
 
-	gOUT += 'style=' 
-	gOUT += '"'
-	gOUT += str(sCustomCSS)
-	
-	try:
-		gOUT += 'text-align:'+str(dbCPA[iKey]).split("|")[0] + ';'
-	except:
-		gOUT += ''
-	
-	try:
-		gOUT += 'background-color:'+str(dbCPB[iKey]) + ';'
-	except:
-		gOUT += ''
+	vStyle = ""
+
+	if iCP.alignment != None:
+		vStyle += 'text-align:' + str(iCP.alignment).split("|")[0] + ';'
 	
-	try:
-		gOUT += 'font-weight:'+str(dbCPS[iKey]) + ';'
-	except:
-		gOUT += ''
+	if iCP.background != None:
+		vStyle += 'background-color:' + str(iCP.background) + ';'
 	
+	if iCP.style != None:
+		vStyle += 'font-weight:' + str(iCP.style) + ';'
+
+	return vStyle
+
+
+# ###################################################################################################################
+def getHTMLopen(iEX, iCP, iC):
+
+	# merged cell can be wider than the table, e.g. separator line, 
+	# so colspan is cut to the last column and the table rows have the same width
+	vCS = iCP.colSpan
+	vKey = iCP
+	if vCS != None and iC + vCS - 1 > iEX.db.maxC:
+		vCS = iEX.db.maxC - iC + 1
+		vKey = ( iCP, vCS )
+
+	# cells with the same decoration share cell properties, 
+	# so the open tag is created only once for each of them
+	vTD = iEX.htmlTD.get(vKey)
+	if vTD != None:
+		return vTD
+
+	vAttr = []
 
-	gOUT += '"'
-	gOUT += '>'
-	gOUT += str(iCell)
-	gOUT += "</TD>\n"
+	if vCS != None:
+		vAttr.append('colspan="' + str(vCS) + '"')
+
+	if iCP.rowSpan != None:
+		vAttr.append('rowspan="' + str(iCP.rowSpan) + '"')
+
+	if iEX.sCSSclass == "yes":
+		vClass = iEX.htmlClass.get(getHTMLstyle(iCP))
+		if vClass != None:
+			vAttr.append('class="' + vClass + '"')
+	else:
+		vAttr.append('style="' + str(iEX.sCustomCSS) + getHTMLstyle(iCP) + '"')
+
+	if len(vAttr) > 0:
+		vTD = '  <TD ' + " ".join(vAttr) + '>'
+	else:
+		vTD = '  <TD>'
+
+	iEX.htmlTD[vKey] = vTD
+
+	return vTD
 
 
 # ###################################################################################################################
@@ -670,53 +1078,77 @@ def HTMLcell(iKey, iCell, iC, iR):
 
 
 # ###################################################################################################################
-def JSONbegin():
-	global gOUT
+def JSONbegin(iEX):
 
-	gOUT += '['
+	iEX.out.append('[')
+	iEX.sepR = ''
 
 
 # ###################################################################################################################
-def JSONend():
-	global gOUT
+def JSONend(iEX):
 
-	gOUT = gOUT[:-1]
-	gOUT += ']'
+	iEX.out.append(']')
 
 
 # ###################################################################################################################
-def JSONrowOpen():
-	global gOUT
+def JSONrowOpen(iEX):
 
-	gOUT += '{'
+	# separator is written before the next row, so nothing written needs to be removed later
+	iEX.out.append(iEX.sepR)
+	iEX.out.append('{')
+	iEX.sepR = ','
+	iEX.sepC = ''
 
 
 # ###################################################################################################################
-def JSONrowClose():
-	global gOUT
+def JSONrowClose(iEX):
 
-	gOUT = gOUT[:-1]
-	gOUT += '},'
+	iEX.out.append('}')
 
 
 # ###################################################################################################################
-def JSONempty(iKey, iC, iR):
-	global gOUT
+def JSONempty(iEX, iCP, iC, iR):
 
 	key = str(dbSKL[str(iC)])
-	gOUT += '"' + str(key) + '":'
-	gOUT += '"' + str(sEmptyCell) + '"'
-	gOUT += ','
+	iEX.out.append(iEX.sepC)
+	iEX.out.append('"' + str(key) + '":')
+	iEX.out.append(getJSONstr(iEX.sEmptyCell))
+	iEX.sepC = ','
+
+
+# ###################################################################################################################
+def JSONemptyRun(iEX, iC, iN, iR):
+
+	# each empty cell has its own column key
+	vEmpty = getJSONstr(iEX.sEmptyCell)
+	vRun = []
+
+	c = iC
+	while c < iC + iN:
+		vRun.append(iEX.sepC + '"' + str(dbSKL[str(c)]) + '":' + vEmpty)
+		iEX.sepC = ','
+		c = c + 1
+
+	iEX.out.append("".join(vRun))
 
 
 # ###################################################################################################################
-def JSONcell(iKey, iCell, iC, iR):
-	global gOUT
+def JSONcell(iEX, iCP, iCell, iC, iR):
 
 	key = str(dbSKL[str(iC)])
-	gOUT += '"' + str(key) + '":'
-	gOUT += '"' + str(iCell) + '"'
-	gOUT += ','
+	iEX.out.append(iEX.sepC)
+	iEX.out.append('"' + str(key) + '":')
+	iEX.out.append(getJSONstr(iCell))
+	iEX.sepC = ','
+
+
+# ###################################################################################################################
+def getJSONstr(iValue):
+
+	import json
+
+	# quotes, backslashes and control characters have to be escaped
+	return json.dumps(str(iValue), ensure_ascii=False)
 
 
 # ###################################################################################################################
@@ -725,609 +1157,2758 @@ def JSONcell(iKey, iCell, iC, iR):
 
 
 # ###################################################################################################################
-def MDbegin():
-	global gOUT
+def MDbegin(iEX):
 
 	c = 1
-	while c < dbMaxC + 1:
-		gOUT += '|   '
+	while c < iEX.db.maxC + 1:
+		iEX.out.append('|   ')
 		c = c + 1
 
-	gOUT += '|\n'
+	iEX.out.append('|\n')
+
+	# cells from 2nd row by column
+	vRow2 = dict()
+	if 2 in iEX.db.rows:
+		vRow2 = dict(zip(iEX.db.rows[2].columns, iEX.db.rows[2].props))
 
 	c = 1
-	while c < dbMaxC + 1:
+	while c < iEX.db.maxC + 1:
 
 		# set alignment
-		try:	
+		# check 2nd row with data
+		# first row can be header with colspans
+		vCP = vRow2.get(c)
 
-			# check 2nd row with data
-			# first row can be header with colspans
-			key = str(dbSKL[str(c)]) + str(2)
-			a = str(dbCPA[key]).split("|")[0]
+		if vCP != None and vCP.alignment != None:
+
+			a = str(vCP.alignment).split("|")[0]
 
 			if a == "left":
-				gOUT += '|:--'
+				iEX.out.append('|:--')
 			if a == "right":
-				gOUT += '|--:'
+				iEX.out.append('|--:')
 			if a == "center":
-				gOUT += '|:-:'
-		except:
-			gOUT += '|---'
+				iEX.out.append('|:-:')
+		else:
+			iEX.out.append('|---')
 
 		c = c + 1
 
-	gOUT += '|\n'
+	iEX.out.append('|\n')
 
 
 # ###################################################################################################################
-def MDend():
-	global gOUT
+def MDend(iEX):
 
-	gOUT += ''
+	iEX.out.append('')
 
 
 # ###################################################################################################################
-def MDrowOpen():
-	global gOUT
+def MDrowOpen(iEX):
 
-	gOUT += ''
+	iEX.out.append('')
+	iEX.sepC = ''
+	iEX.pendC = 0
 
 
 # ###################################################################################################################
-def MDrowClose():
-	global gOUT
+def MDrowClose(iEX):
 
-	gOUT += '|'
-	gOUT += '\n'
+	# row without content is written later only if there is row with content after it
+	if iEX.sCompact == "yes" and iEX.sepC == '':
+		iEX.pendR = iEX.pendR + 1
+		return
+
+	iEX.out.append('|')
+	iEX.out.append('\n')
 
 
 # ###################################################################################################################
-def MDempty(iKey, iC, iR):
-	global gOUT
+def MDempty(iEX, iCP, iC, iR):
 
-	gOUT += '|   '
-	gOUT += str(sEmptyCell)
+	if iEX.sCompact == "yes":
+		iEX.pendC = iEX.pendC + 1
+		return
 
+	iEX.out.append('|   ')
+	iEX.out.append(str(iEX.sEmptyCell))
 
-# ###################################################################################################################
-def MDcell(iKey, iCell, iC, iR):
-	global gOUT
 
-	gOUT += '|   '
-	gOUT += str(iCell)
-	gOUT += '   '
+# ###################################################################################################################
+def MDemptyRun(iEX, iC, iN, iR):
 
+	if iEX.sCompact == "yes":
+		iEX.pendC = iEX.pendC + iN
+		return
 
-# ###################################################################################################################
-# Database write controller
-# ###################################################################################################################
+	iEX.out.append(('|   ' + str(iEX.sEmptyCell)) * iN)
 
 
 # ###################################################################################################################
-def getKey(iC, iR):
-
-	letters = "ZABCDEFGHIJKLMNOPQRSTUVWXYZ" # max 26
+def MDcell(iEX, iCP, iCell, iC, iR):
 
-	mod = int((iC % 26))
-	div = int((iC - 1) / 26) 
+	# empty rows and empty cells are written only before cell with content, 
+	# empty row has one empty cell and missing cells at the end of row are shown as empty
+	if iEX.sCompact == "yes":
 
-	keyC = ""
+		if iEX.sepC == '':
+			iEX.out.append(('|   ' + str(iEX.sEmptyCell) + '|\n') * iEX.pendR)
+			iEX.pendR = 0
 
-	if iC < 27:
-		keyC = letters[iC]
-	else:
-		keyC = letters[div] + letters[mod]
+		iEX.out.append(('|   ' + str(iEX.sEmptyCell)) * iEX.pendC)
+		iEX.sepC = '|'
+		iEX.pendC = 0
 
-	keyR = str(iR)
+	iEX.out.append('|   ')
+	iEX.out.append(str(iCell))
+	iEX.out.append('   ')
 
-	key = keyC + keyR
 
-	# for given column and row it returns
-	# spreadsheet key for cell like e.g. A5, AG125 etc
-	return str(key)
+# ###################################################################################################################
+# SQLite file format
+# ###################################################################################################################
 
 
 # ###################################################################################################################
-def setSK():
+def getSQLITErows(iEX):
 
-	# set spreadsheet keys databases
-	c = 1
-	while c < 703:
+	# cells with content or background, the same as for max row and column, 
+	# values not supported by SQLite, e.g. FreeCAD quantity, are written as text
+	for r in sorted(iEX.db.rows):
+		for vC, vValue, vCP in zip(iEX.db.rows[r].columns, iEX.db.rows[r].values, iEX.db.rows[r].props):
 
-		# get key for first row and remove number
-		key = getKey(c, 1)[:-1]
-		
-		# set spreadsheet key value
-		dbSKV[key] = c
+			if vValue == None and vCP.background == None:
+				continue
 
-		# set spreadsheet key letter
-		dbSKL[str(c)] = key
+			if vValue != None and type(vValue) not in (int, float, str):
+				vValue = str(vValue)
 
-		# go to next column
-		c = c + 1
+			yield ( iEX.label, r, vC, vValue, vCP.alignment, vCP.style, vCP.background )
 
 
 # ###################################################################################################################
-def setDB():
+def SQLITEsave(iEX, iFile):
 
-	# import regular expressions
-	import re
+	import sqlite3
 
-	# refer to globals
-	global dbMaxR
-	global dbMaxC
-	
-	# XML parse part from python doc
-	import xml.etree.ElementTree as ET
-	result = str(gSheet.cells.Content)
-	root = ET.fromstring(result)
+	# all spreadsheets of document are in one file, so old cells of the spreadsheet are removed 
+	# and new cells are inserted in one transaction, the value column converts numbers given 
+	# as text to numbers, e.g. from worker process, the index is not updated for each insert, 
+	# it is created by SQLITEindex() once after all spreadsheets are written
+	vDB = sqlite3.connect(iFile, timeout=60)
 
-	# set only available data
-	for child in root:
-		root2 = dict(child.attrib)
-		
-		# skip data not related to cells
-		try:
-			key = root2["address"]
-		except:
-			continue
+	try:
+		with vDB:
+			vDB.execute("CREATE TABLE IF NOT EXISTS sheets (sheet TEXT PRIMARY KEY, rows INTEGER, cols INTEGER)")
+			vDB.execute("CREATE TABLE IF NOT EXISTS cells (sheet TEXT, row INTEGER, col INTEGER, "
+				+ "value NUMERIC, alignment TEXT, style TEXT, background TEXT)")
+			vDB.execute("DELETE FROM cells WHERE sheet = ?", ( iEX.label, ))
+			vDB.execute("DROP INDEX IF EXISTS cells_sheet")
+			vDB.execute("INSERT OR REPLACE INTO sheets VALUES (?, ?, ?)", ( iEX.label, iEX.db.maxR, iEX.db.maxC ))
+			vDB.executemany("INSERT INTO cells VALUES (?, ?, ?, ?, ?, ?, ?)", getSQLITErows(iEX))
+	finally:
+		vDB.close()
 
-		try:
-			# the XML parse may not be consistent with the FreeCAD spreadsheet objects,
-			# the XML may contains extra characters like "=" or '' so you have to write 
-			# the FreeCAD content not the XML content with the extra characters
-			dbCPC[key] = gSheet.get(key)
-		except:
-			skip = 1
 
-		try:
-			dbCPA[key] = root2["alignment"]
-		except:
-			skip = 1
+# ###################################################################################################################
+def SQLITEindex(iFile):
 
-		try:
-			dbCPS[key] = root2["style"]
-		except:
-			skip = 1
+	import sqlite3
 
-		try:
-			dbCPB[key] = root2["backgroundColor"]
-		except:
-			skip = 1
+	vDB = sqlite3.connect(iFile, timeout=60)
 
-		try:
-			dbCPRS[key] = root2["rowSpan"]
-		except:
-			skip = 1
+	try:
+		with vDB:
+			vDB.execute("CREATE INDEX IF NOT EXISTS cells_sheet ON cells (sheet, row, col)")
+	finally:
+		vDB.close()
 
-		try:
-			dbCPCS[key] = root2["colSpan"]
-		except:
-			skip = 1
 
-		# width is not set because web pages and other formats has its own 
-		# page size, for advance science data the spreadsheet can be even 
-		# for ZZ column, so its not make any sense to recalculate it, 
-		# width of column should be in auto mode, as small as possible 
-		# but keep the text readable and possible to print, 
-		# columns can be adjusted manually if needed
+# ###################################################################################################################
+# NumPy file format
+# ###################################################################################################################
 
-	# set max row and max column
-	# search keys in content db
-	for k in dbCPC.keys():
-		
-		# split spreadsheet key to word and number
-		res = [re.findall(r'(\w+?)(\d+)', str(k))[0] ]
 
-		w = str(res[0][0]) # word column
-		n = int(res[0][1]) # number rows
-		
-		if int(dbSKV[w]) > int(dbMaxC):
-			dbMaxC = int(dbSKV[w])
-		
-		if int(n) > int(dbMaxR):
-			dbMaxR = int(n)
+# ###################################################################################################################
+def isNumber(iValue):
+
+	try:
+		float(iValue)
+		return True
+	except:
+		return False
+
+
+# ###################################################################################################################
+def getNPZgrid(iEX):
+
+	import numpy
+
+	# all cells in table, empty cells are None, the cells are set for each row at once
+	vMaxR = iEX.db.maxR
+	vMaxC = iEX.db.maxC
+	vGrid = numpy.full((vMaxR, vMaxC), None, dtype=object)
+
+	for r, vRow in iEX.db.rows.items():
+
+		if r > vMaxR:
+			continue
+
+		vC = numpy.array(vRow.columns, dtype=numpy.intp) - 1
+		vV = numpy.empty(len(vRow.values), dtype=object)
+		vV[:] = vRow.values
+		vKeep = vC < vMaxC
+		vGrid[r - 1, vC[vKeep]] = vV[vKeep]
+
+	return vGrid
+
+
+# ###################################################################################################################
+def getNPZcolumn(iColumn):
+
+	import numpy
+
+	# the whole column is converted at once, from text because worker process gets values as text, 
+	# if any cell is not number this is text column
+	vEmpty = numpy.equal(iColumn, None)
+	vText = iColumn.astype(str)
+	vText[vEmpty] = "nan"
+
+	try:
+		vNum = vText.astype(numpy.float64)
+	except ValueError:
+		vText[vEmpty] = ""
+		return vText
+
+	# integers only if there is no empty cell, NaN is only for float
+	if not vEmpty.any() and numpy.all(numpy.mod(vNum, 1) == 0) and numpy.all(numpy.abs(vNum) < 2**53):
+		return vNum.astype(numpy.int64)
+
+	return vNum
+
+
+# ###################################################################################################################
+def NPZsave(iEX, iFile):
+
+	import numpy
+
+	vGrid = getNPZgrid(iEX)
+
+	# header rows at the top have no numbers, e.g. column names
+	h = 0
+	while h < len(vGrid) and not any([ isNumber(v) for v in vGrid[h] if v != None ]):
+		h = h + 1
+
+	vHeader = vGrid[:h].astype(str)
+	vHeader[numpy.equal(vGrid[:h], None)] = ""
+
+	vColumns = [ getNPZcolumn(vGrid[h:, c]) for c in range(vGrid.shape[1]) ]
+	vLetters = [ getKey(c, 1)[:-1] for c in range(1, vGrid.shape[1] + 1) ]
+
+	vArrays = dict()
+	vArrays["header"] = vHeader
+	vArrays["columns"] = numpy.array(vLetters, dtype=str)
+
+	# numeric table is one 2D array, otherwise each column is array with its own type, 
+	# the arrays have no Python objects, so numpy.load() reads them without pickle
+	if len(vColumns) > 0 and all([ vCol.dtype.kind in "if" for vCol in vColumns ]):
+		vArrays["data"] = numpy.column_stack(vColumns)
+	else:
+		for vLetter, vCol in zip(vLetters, vColumns):
+			vArrays[vLetter] = vCol
+
+	if iEX.sCompress == "no":
+		numpy.savez(iFile, **vArrays)
+	else:
+		numpy.savez_compressed(iFile, **vArrays)
+
+
+# ###################################################################################################################
+# XLSX file format
+# ###################################################################################################################
+
+
+# ###################################################################################################################
+def XLSXbegin(iEX):
+
+	iEX.out.append('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n')
+	iEX.out.append('<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>\n')
+
+
+# ###################################################################################################################
+def XLSXend(iEX):
+
+	iEX.out.append('</sheetData>')
+
+	# merged cells are after all rows in the sheet
+	if len(iEX.xlsxMerge) > 0:
+		iEX.out.append('<mergeCells count="' + str(len(iEX.xlsxMerge)) + '">')
+		iEX.out.append("".join([ '<mergeCell ref="' + vRef + '"/>' for vRef in iEX.xlsxMerge ]))
+		iEX.out.append('</mergeCells>')
+
+	iEX.out.append('</worksheet>\n')
+
+
+# ###################################################################################################################
+def XLSXrowOpen(iEX):
+
+	iEX.out.append('<row>')
+
+
+# ###################################################################################################################
+def XLSXrowClose(iEX):
+
+	iEX.out.append('</row>\n')
+
+
+# ###################################################################################################################
+def XLSXempty(iEX, iCP, iC, iR):
+
+	# cell without content is written only for decoration, e.g. background color
+	setXLSXmerge(iEX, iCP, iC, iR)
+
+	vS = getXLSXstyle(iEX, iCP)
+	if vS > 0:
+		iEX.out.append('<c r="' + getKey(iC, iR) + '" s="' + str(vS) + '"/>')
+
+
+# ###################################################################################################################
+def XLSXemptyRun(iEX, iC, iN, iR):
+
+	# not needed, each cell has its own address
+	return
+
+
+# ###################################################################################################################
+def XLSXcell(iEX, iCP, iCell, iC, iR):
+
+	setXLSXmerge(iEX, iCP, iC, iR)
+
+	vCell = '<c r="' + getKey(iC, iR) + '"'
+
+	vS = getXLSXstyle(iEX, iCP)
+	if vS > 0:
+		vCell += ' s="' + str(vS) + '"'
+
+	if isXLSXnumber(iEX.value):
+		iEX.out.append(vCell + '><v>' + iCell + '</v></c>')
+		return
+
+	# the same text is stored only once in shared strings
+	vIndex = iEX.xlsxStrings.get(iCell)
+	if vIndex == None:
+		vIndex = len(iEX.xlsxStrings)
+		iEX.xlsxStrings[iCell] = vIndex
+
+	iEX.out.append(vCell + ' t="s"><v>' + str(vIndex) + '</v></c>')
+
+
+# ###################################################################################################################
+def isXLSXnumber(iValue):
+
+	import math
+
+	# number type comes from FreeCAD or stored content, text like '007 is kept as text, 
+	# the sheet XML has no inf or nan
+	if type(iValue) not in ( int, float ):
+		return False
+
+	try:
+		return math.isfinite(iValue)
+	except OverflowError:
+		return False
+
+
+# ###################################################################################################################
+def setXLSXmerge(iEX, iCP, iC, iR):
+
+	if iCP.colSpan == None and iCP.rowSpan == None:
+		return
+
+	vC = iC + (iCP.colSpan or 1) - 1
+	vR = iR + (iCP.rowSpan or 1) - 1
+
+	if vC > iC or vR > iR:
+		iEX.xlsxMerge.append(getKey(iC, iR) + ':' + getKey(vC, vR))
+
+
+# ###################################################################################################################
+def getXLSXstyle(iEX, iCP):
+
+	# cellXfs index is set once for each decoration, 0 is default style
+	vS = iEX.xlsxStyles.get(iCP)
+	if vS != None:
+		return vS
+
+	vStyle = str(iCP.style or "")
+	vFont = ( "bold" in vStyle, "italic" in vStyle, "underline" in vStyle )
+	vKey = ( vFont, iCP.background, iCP.alignment )
+
+	if vKey == ( ( False, False, False ), None, None ):
+		vS = 0
+	else:
+		vS = iEX.xlsxXfs.get(vKey)
+		if vS == None:
+			vS = len(iEX.xlsxXfs) + 1
+			iEX.xlsxXfs[vKey] = vS
+
+	iEX.xlsxStyles[iCP] = vS
+
+	return vS
+
+
+# ###################################################################################################################
+def getXLSXstyles(iEX):
+
+	# fonts and fills are shared by cellXfs, the first two fills are required by Excel
+	vFonts = { ( False, False, False ): 0 }
+	vFills = { None: 0, "gray125": 1 }
+	vXfs = []
+
+	for vFont, vFill, vAlign in iEX.xlsxXfs:
+
+		vFontId = vFonts.setdefault(vFont, len(vFonts))
+		vFillId = vFills.setdefault(vFill, len(vFills))
+
+		vXf = '<xf numFmtId="0" fontId="' + str(vFontId) + '" fillId="' + str(vFillId) + '" borderId="0" xfId="0"'
+		vXf += ' applyFont="1" applyFill="1"'
+
+		if vAlign == None:
+			vXfs.append(vXf + '/>')
+			continue
+
+		# FreeCAD alignment is e.g. left|vcenter
+		vAlignment = ""
+		for a in str(vAlign).split("|"):
+			if a in ( "left", "center", "right" ):
+				vAlignment += ' horizontal="' + a + '"'
+			if a in ( "top", "bottom" ):
+				vAlignment += ' vertical="' + a + '"'
+			if a == "vcenter":
+				vAlignment += ' vertical="center"'
+
+		vXfs.append(vXf + ' applyAlignment="1"><alignment' + vAlignment + '/></xf>')
+
+	vXML = [ '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n' ]
+	vXML.append('<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">')
+
+	vXML.append('<fonts count="' + str(len(vFonts)) + '">')
+	for vBold, vItalic, vUnderline in vFonts:
+		vXML.append('<font>' + ('<b/>' if vBold else '') + ('<i/>' if vItalic else '') 
+			+ ('<u/>' if vUnderline else '') + '<sz val="11"/><name val="Calibri"/></font>')
+	vXML.append('</fonts>')
+
+	# FreeCAD color is #rrggbbaa, Excel color is AARRGGBB
+	vXML.append('<fills count="' + str(len(vFills)) + '">')
+	for vFill in vFills:
+		if vFill == None:
+			vXML.append('<fill><patternFill patternType="none"/></fill>')
+		elif vFill == "gray125":
+			vXML.append('<fill><patternFill patternType="gray125"/></fill>')
+		else:
+			vXML.append('<fill><patternFill patternType="solid"><fgColor rgb="FF' + str(vFill)[1:7].upper() 
+				+ '"/><bgColor indexed="64"/></patternFill></fill>')
+	vXML.append('</fills>')
+
+	vXML.append('<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>')
+	vXML.append('<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>')
+	vXML.append('<cellXfs count="' + str(len(vXfs) + 1) + '">')
+	vXML.append('<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>')
+	vXML.append("".join(vXfs))
+	vXML.append('</cellXfs>')
+	vXML.append('<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>')
+	vXML.append('</styleSheet>\n')
+
+	return "".join(vXML)
+
+
+# ###################################################################################################################
+def getXLSXstrings(iEX):
+
+	from xml.sax.saxutils import escape
+
+	# texts in index order, dict keeps insertion order
+	vXML = [ '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n' ]
+	vXML.append('<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" uniqueCount="' 
+		+ str(len(iEX.xlsxStrings)) + '">')
+
+	for vText in iEX.xlsxStrings:
+		vXML.append('<si><t xml:space="preserve">' + escape(vText) + '</t></si>')
+
+	vXML.append('</sst>\n')
+
+	return "".join(vXML)
+
+
+# ###################################################################################################################
+def setXLSXparts(iEX):
+
+	from xml.sax.saxutils import quoteattr
+
+	# Excel sheet name has max 31 characters and some characters are not allowed
+	vName = "".join([ x for x in iEX.label if x not in '[]:*?/\\' ])[:31]
+	if vName == "":
+		vName = "Sheet1"
+
+	vMain = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+	vRel = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+	vType = "application/vnd.openxmlformats-officedocument.spreadsheetml"
+
+	iEX.zip.writestr("[Content_Types].xml", 
+		'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+		+ '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+		+ '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+		+ '<Default Extension="xml" ContentType="application/xml"/>'
+		+ '<Override PartName="/xl/workbook.xml" ContentType="' + vType + '.sheet.main+xml"/>'
+		+ '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="' + vType + '.worksheet+xml"/>'
+		+ '<Override PartName="/xl/styles.xml" ContentType="' + vType + '.styles+xml"/>'
+		+ '<Override PartName="/xl/sharedStrings.xml" ContentType="' + vType + '.sharedStrings+xml"/>'
+		+ '</Types>\n')
+
+	iEX.zip.writestr("_rels/.rels", 
+		'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+		+ '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+		+ '<Relationship Id="rId1" Type="' + vRel + '/officeDocument" Target="xl/workbook.xml"/>'
+		+ '</Relationships>\n')
+
+	iEX.zip.writestr("xl/workbook.xml", 
+		'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+		+ '<workbook xmlns="' + vMain + '" xmlns:r="' + vRel + '">'
+		+ '<sheets><sheet name=' + quoteattr(vName) + ' sheetId="1" r:id="rId1"/></sheets>'
+		+ '</workbook>\n')
+
+	iEX.zip.writestr("xl/_rels/workbook.xml.rels", 
+		'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+		+ '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+		+ '<Relationship Id="rId1" Type="' + vRel + '/worksheet" Target="worksheets/sheet1.xml"/>'
+		+ '<Relationship Id="rId2" Type="' + vRel + '/styles" Target="styles.xml"/>'
+		+ '<Relationship Id="rId3" Type="' + vRel + '/sharedStrings" Target="sharedStrings.xml"/>'
+		+ '</Relationships>\n')
+
+
+# ###################################################################################################################
+def XLSXopen(iEX, iFile):
+
+	import io, zipfile
+
+	# rows are written directly to compressed sheet in zip file, 
+	# shared strings and styles are known at the end, so they are written later
+	iEX.zip = zipfile.ZipFile(iFile, "w", zipfile.ZIP_DEFLATED)
+	setXLSXparts(iEX)
+
+	return io.TextIOWrapper(iEX.zip.open("xl/worksheets/sheet1.xml", "w"), encoding="utf-8")
+
+
+# ###################################################################################################################
+def XLSXsave(iEX, iFile):
+
+	import zipfile
+
+	if iEX.stream != None:
+
+		flushOUT(iEX)
+		iEX.stream.close()
+		iEX.stream = None
+		iEX.file = ""
+
+	else:
+
+		iEX.zip = zipfile.ZipFile(iFile, "w", zipfile.ZIP_DEFLATED)
+		setXLSXparts(iEX)
+		iEX.zip.writestr("xl/worksheets/sheet1.xml", "".join(iEX.out))
+
+	iEX.zip.writestr("xl/sharedStrings.xml", getXLSXstrings(iEX))
+	iEX.zip.writestr("xl/styles.xml", getXLSXstyles(iEX))
+	iEX.zip.close()
+	iEX.zip = None
+
+
+# ###################################################################################################################
+# Database write controller
+# ###################################################################################################################
+
+
+# ###################################################################################################################
+def getKey(iC, iR):
+
+	letters = "ZABCDEFGHIJKLMNOPQRSTUVWXYZ" # max 26
+
+	mod = int((iC % 26))
+	div = int((iC - 1) / 26) 
+
+	keyC = ""
+
+	if iC < 27:
+		keyC = letters[iC]
+	else:
+		keyC = letters[div] + letters[mod]
+
+	keyR = str(iR)
+
+	key = keyC + keyR
+
+	# for given column and row it returns
+	# spreadsheet key for cell like e.g. A5, AG125 etc
+	return str(key)
+
+
+# ###################################################################################################################
+def setSK():
+
+	# set spreadsheet keys databases
+	c = 1
+	while c < 703:
+
+		# get key for first row and remove number
+		key = getKey(c, 1)[:-1]
+		
+		# set spreadsheet key value
+		dbSKV[key] = c
+
+		# set spreadsheet key letter
+		dbSKL[str(c)] = key
+
+		# go to next column
+		c = c + 1
+
+
+# ###################################################################################################################
+def getColRow(iKey):
+
+	# split spreadsheet key like e.g. AG125 to column and row number
+	i = 0
+	while iKey[i].isalpha():
+		i = i + 1
+
+	return dbSKV[iKey[:i]], int(iKey[i:])
+
+
+# ###################################################################################################################
+def iterCells(iContent):
+
+	# XML parse part from python doc
+	import xml.etree.ElementTree as ET
+
+	# the XML is given to the parser in parts and each cell is removed from tree 
+	# after reading, so there is no full XML tree in memory even for big spreadsheet
+	vParser = ET.XMLPullParser(events=("start", "end"))
+	vRoot = None
+	vSize = 65536
+	i = 0
+
+	while True:
+
+		if i < len(iContent):
+			vParser.feed(iContent[i:i+vSize])
+			i = i + vSize
+		else:
+			vParser.close()
+
+		for vEvent, vElem in vParser.read_events():
+
+			if vEvent == "start":
+				if vRoot == None:
+					vRoot = vElem
+				continue
+
+			if vElem.tag == "Cell":
+				yield dict(vElem.attrib)
+				vElem.clear()
+
+		# remove already read cells
+		if vRoot != None:
+			del vRoot[:]
+
+		if i >= len(iContent):
+			break
+
+
+# ###################################################################################################################
+def getLiteral(iContent):
+
+	# empty cell
+	if iContent == None or iContent == "":
+		return None
+
+	# formula, FreeCAD has to calculate the value
+	if iContent[0] == "=":
+		return None
+
+	# text forced by apostrophe, e.g. '12 is text 12 not number
+	if iContent[0] == "'":
+		if len(iContent) > 1:
+			return iContent[1:]
+		return None
+
+	# number or quantity like 12, -1.5, 10 mm, FreeCAD converts it, 
+	# e.g. 2.0 is returned as 2 and 1.50 as 1.5, so leave it for FreeCAD
+	vStart = iContent.lstrip()
+	if vStart[:1] in ("0","1","2","3","4","5","6","7","8","9","+","-","."):
+		return None
+	if vStart[:3].lower() in ("inf","nan"):
+		return None
+
+	# plain text, the same as FreeCAD returns
+	return iContent
+
+
+# ###################################################################################################################
+def getStored(iContent):
+
+	# number written the same way as FreeCAD returns it, e.g. 2.0 as 2 and 1.50 as 1.5, 
+	# other content like formula or quantity with unit is written as stored in XML
+	try:
+		vNum = float(iContent)
+	except:
+		return iContent
+
+	if vNum.is_integer():
+		return int(vNum)
+
+	return vNum
+
+
+# ###################################################################################################################
+def setDBcell(iDB, root2, iGetValue=None):
+
+	# skip data not related to cells
+	try:
+		key = root2["address"]
+	except:
+		return 0
+
+	# column and row number are decoded only once here
+	vC, vR = getColRow(key)
+
+	# plain text can be taken directly from XML
+	vValue = getLiteral(root2.get("content"))
+
+	if vValue != None:
+		iDB.apiSkip = iDB.apiSkip + 1
+
+	elif "content" in root2 and iGetValue == None:
+
+		# without FreeCAD there is only stored content, e.g. formula text
+		vValue = getStored(root2["content"])
+
+	elif "content" in root2:
+		try:
+			# the XML parse may not be consistent with the FreeCAD spreadsheet objects,
+			# the XML may contains extra characters like "=" or '' so you have to write 
+			# the FreeCAD content not the XML content with the extra characters
+			iDB.apiCalls = iDB.apiCalls + 1
+			vValue = iGetValue(key)
+		except:
+			skip = 1
+
+	vRS = root2.get("rowSpan")
+	if vRS != None:
+		vRS = int(vRS)
+
+	vCS = root2.get("colSpan")
+	if vCS != None:
+		vCS = int(vCS)
+
+	# decoration repeats a lot, so cells with the same decoration share properties
+	vProps = ( root2.get("alignment"), root2.get("style"), root2.get("backgroundColor"), vRS, vCS )
+	vCP = iDB.props.get(vProps)
+	if vCP == None:
+		vCP = CellProperties(*vProps)
+		iDB.props[vProps] = vCP
+
+	# group stored cells by rows
+	vRow = iDB.rows.get(vR)
+	if vRow == None:
+		vRow = RowCells()
+		iDB.rows[vR] = vRow
+
+	vRow.add(vC, vValue, vCP)
+
+	# merged cell covers other cells, also in next rows
+	if vRS != None or vCS != None:
+		setDBspan(iDB, vC, vR, vRS or 1, vCS or 1)
+
+	# set max row and max column, search cells with content 
+	# and also with background, this can be page separator line using background color
+	if vValue != None or vCP.background != None:
+
+		if vC > iDB.maxC:
+			iDB.maxC = vC
+
+		if vR > iDB.maxR:
+			iDB.maxR = vR
+
+	# width is not set because web pages and other formats has its own 
+	# page size, for advance science data the spreadsheet can be even 
+	# for ZZ column, so its not make any sense to recalculate it, 
+	# width of column should be in auto mode, as small as possible 
+	# but keep the text readable and possible to print, 
+	# columns can be adjusted manually if needed
+
+
+# ###################################################################################################################
+def setDBspan(iDB, iC, iR, iRS, iCS):
+
+	# the merged cell itself is not covered, only cells on the right and below
+	vEnd = iC + iCS
+
+	for r in range(iR, iR + iRS):
+
+		vMask = iDB.covered.get(r)
+		if vMask == None:
+			vMask = bytearray()
+			iDB.covered[r] = vMask
+
+		if len(vMask) < vEnd:
+			vMask.extend(bytes(vEnd - len(vMask)))
+
+		vStart = iC + 1 if r == iR else iC
+		vMask[vStart:vEnd] = b"\x01" * (vEnd - vStart)
+
+
+# ###################################################################################################################
+def setDBend(iDB):
+
+	# cells in row are walked from left to right
+	for vRow in iDB.rows.values():
+		vRow.sort()
+
+	# each column up to max column can be checked without range check
+	for vMask in iDB.covered.values():
+		if len(vMask) <= iDB.maxC:
+			vMask.extend(bytes(iDB.maxC + 1 - len(vMask)))
+
+
+# ###################################################################################################################
+def setDB(iDB, iCells, iGetValue=None):
+
+	vStats = iDB.stats
+
+	# with statistics the value getter is measured separately from parse
+	if vStats != None:
+		import time
+		start = time.perf_counter()
+		if iGetValue != None:
+			iGetValue = getTimed(vStats, iGetValue)
+
+	# cells can be given as spreadsheet XML or any iterator of cell attributes
+	if isinstance(iCells, str):
+		iCells = iterCells(iCells)
+
+	# set only available data, cells are parsed one by one
+	for root2 in iCells:
+		setDBcell(iDB, root2, iGetValue)
+
+	setDBend(iDB)
+
+	if vStats != None:
+		vStats.parse = vStats.parse + time.perf_counter() - start - vStats.get
+		vStats.cells = sum([ len(vRow.values) - vRow.values.count(None) for vRow in iDB.rows.values() ])
+		vStats.apiCalls = iDB.apiCalls
+		vStats.apiSkip = iDB.apiSkip
+	
+
+# ###################################################################################################################
+# File format selector
+# ###################################################################################################################
+
+
+# ###################################################################################################################
+def selectBegin(iEX):
+
+	if iEX.sFileType == "csv":
+		CSVbegin(iEX)
+
+	if iEX.sFileType == "html":
+		HTMLbegin(iEX)
+
+	if iEX.sFileType == "json":
+		JSONbegin(iEX)
+
+	if iEX.sFileType == "md":
+		MDbegin(iEX)
+
+	if iEX.sFileType == "xlsx":
+		XLSXbegin(iEX)
+
+
+# ###################################################################################################################
+def selectEnd(iEX):
+
+	if iEX.sFileType == "csv":
+		CSVend(iEX)
+
+	if iEX.sFileType == "html":
+		HTMLend(iEX)
+
+	if iEX.sFileType == "json":
+		JSONend(iEX)
+
+	if iEX.sFileType == "md":
+		MDend(iEX)
+
+	if iEX.sFileType == "xlsx":
+		XLSXend(iEX)
+
+
+# ###################################################################################################################
+def selectRowOpen(iEX):
+
+	if iEX.sFileType == "csv":
+		CSVrowOpen(iEX)
+
+	if iEX.sFileType == "html":
+		HTMLrowOpen(iEX)
+
+	if iEX.sFileType == "json":
+		JSONrowOpen(iEX)
+
+	if iEX.sFileType == "md":
+		MDrowOpen(iEX)
+
+	if iEX.sFileType == "xlsx":
+		XLSXrowOpen(iEX)
+
+
+# ###################################################################################################################
+def selectRowClose(iEX):
+
+	if iEX.sFileType == "csv":
+		CSVrowClose(iEX)
+
+	if iEX.sFileType == "html":
+		HTMLrowClose(iEX)
+
+	if iEX.sFileType == "json":
+		JSONrowClose(iEX)
+
+	if iEX.sFileType == "md":
+		MDrowClose(iEX)
+
+	if iEX.sFileType == "xlsx":
+		XLSXrowClose(iEX)
+
+
+# ###################################################################################################################
+def selectEmpty(iEX, iCP, iC, iR):
+
+	if iEX.sFileType == "csv":
+		CSVempty(iEX, iCP, iC, iR)
+
+	if iEX.sFileType == "html":
+		HTMLempty(iEX, iCP, iC, iR)
+
+	if iEX.sFileType == "json":
+		JSONempty(iEX, iCP, iC, iR)
+
+	if iEX.sFileType == "md":
+		MDempty(iEX, iCP, iC, iR)
+
+	if iEX.sFileType == "xlsx":
+		XLSXempty(iEX, iCP, iC, iR)
+
+
+# ###################################################################################################################
+def selectEmptyRun(iEX, iC, iN, iR):
+
+	if iEX.sFileType == "csv":
+		CSVemptyRun(iEX, iC, iN, iR)
+
+	if iEX.sFileType == "html":
+		HTMLemptyRun(iEX, iC, iN, iR)
+
+	if iEX.sFileType == "json":
+		JSONemptyRun(iEX, iC, iN, iR)
+
+	if iEX.sFileType == "md":
+		MDemptyRun(iEX, iC, iN, iR)
+
+	if iEX.sFileType == "xlsx":
+		XLSXemptyRun(iEX, iC, iN, iR)
+
+
+# ###################################################################################################################
+def selectCell(iEX, iCP, iCell, iC, iR):
+
+	if iEX.sFileType == "csv":
+		CSVcell(iEX, iCP, iCell, iC, iR)
+
+	if iEX.sFileType == "html":
+		HTMLcell(iEX, iCP, iCell, iC, iR)
+
+	if iEX.sFileType == "json":
+		JSONcell(iEX, iCP, iCell, iC, iR)
+
+	if iEX.sFileType == "md":
+		MDcell(iEX, iCP, iCell, iC, iR)
+
+	if iEX.sFileType == "xlsx":
+		XLSXcell(iEX, iCP, iCell, iC, iR)
+
+
+# ###################################################################################################################
+def selectSave(iEX, iFile):
+
+	if iEX.sFileType == "sqlite":
+		SQLITEsave(iEX, iFile)
+
+	if iEX.sFileType == "npz":
+		NPZsave(iEX, iFile)
+
+
+# ###################################################################################################################
+# Set output
+# ###################################################################################################################
+
+
+# ###################################################################################################################
+def setEmptyRun(iEX, iC, iN, iR):
+
+	if iN <= 0:
+		return
+
+	if iEX.covered == None:
+		selectEmptyRun(iEX, iC, iN, iR)
+		iEX.empty = iEX.empty + iN
+		return
+
+	# cells covered by merged cells are skipped for html, so the run is split to not covered parts
+	vMask = iEX.covered
+	vEnd = iC + iN
+	c = iC
+
+	while c < vEnd:
+
+		c = vMask.find(0, c, vEnd)
+		if c == -1:
+			break
+
+		e = vMask.find(1, c, vEnd)
+		if e == -1:
+			e = vEnd
+
+		selectEmptyRun(iEX, c, e - c, iR)
+		iEX.empty = iEX.empty + e - c
+		c = e
+
+
+# ###################################################################################################################
+def setCellOUT(iEX, iC, iR, iCell, iCP):
+
+	# empty cells before the stored cell
+	setEmptyRun(iEX, iEX.c, iC - iEX.c, iR)
+
+	# just go to next column
+	iEX.c = iC + 1
+
+	# cell covered by merged cell is skipped for html, also if it has content
+	if iEX.covered != None and iEX.covered[iC]:
+		return
+
+	if iCell != "":
+		selectCell(iEX, iCP, iCell, iC, iR)
+	else:
+		# the cell has only decoration, e.g. background color
+		selectEmpty(iEX, iCP, iC, iR)
+		iEX.empty = iEX.empty + 1
+
+
+# ###################################################################################################################
+def setOUTPUT(iEX):
+
+	# one export or list of exports for the same database, e.g. for more file types, 
+	# the database is walked once and each cell is given to all of them
+	if isinstance(iEX, list):
+		vEXs = iEX
+	else:
+		vEXs = [ iEX ]
+
+	# file types written directly from database are saved later by saveToDisk()
+	vProgress = vEXs[0].progress
+	vEXs = [ vEX for vEX in vEXs if vEX.sFileType not in gDBTypes ]
+	if len(vEXs) == 0:
+		return "yes"
+
+	vDB = vEXs[0].db
+	vMaxC = vDB.maxC
+
+	# with statistics the write time is measured in flushOUT() and the rest is format time
+	if vDB.stats != None:
+		import time
+		start = time.perf_counter()
+		vWrite = sum([ vEX.timeWrite for vEX in vEXs ])
+
+	# set begin of the spreadsheet table
+	for vEX in vEXs:
+		selectBegin(vEX)
+
+	r = 1
+	
+	# walk thru rows and visit only cells stored in the spreadsheet, 
+	# the empty cells between them are written in bulk
+	while r <= vDB.maxR:
+
+		# the export can be canceled between rows
+		if vProgress != None:
+			if vProgress(r) == "no":
+				return "no"
+
+		# cells covered by merged cells in this row, only html skips them
+		vMask = vDB.covered.get(r)
+
+		# set row extra properties, first column not written yet
+		for vEX in vEXs:
+			selectRowOpen(vEX)
+			vEX.c = 1
+			vEX.covered = vMask if vEX.sFileType == "html" else None
+
+		# go thru stored cells for given row
+		vRow = vDB.rows.get(r)
+		if vRow == None:
+			vRow = RowCells()
+
+		for vC, vValue, vCP in zip(vRow.columns, vRow.values, vRow.props):
+
+			if vC > vMaxC:
+				break
+
+			# get content
+			vCell = ""
+			if vValue != None:
+				vCell = str(vValue)
+
+			for vEX in vEXs:
+				vEX.value = vValue
+				setCellOUT(vEX, vC, r, vCell, vCP)
+
+		for vEX in vEXs:
+
+			# empty cells after the last stored cell
+			setEmptyRun(vEX, vEX.c, vMaxC + 1 - vEX.c, r)
+
+			# add extra close row properties
+			selectRowClose(vEX)
+
+			# write the finished row
+			flushOUT(vEX)
+
+		# set variables for next row
+		r = r + 1
+
+	# set end of the spreadsheet table
+	for vEX in vEXs:
+		selectEnd(vEX)
+		flushOUT(vEX)
+
+	if vDB.stats != None:
+		vWrite = sum([ vEX.timeWrite for vEX in vEXs ]) - vWrite
+		vDB.stats.format = vDB.stats.format + time.perf_counter() - start - vWrite
+
+	return "yes"
+
+
+# ###################################################################################################################
+# Save spreadsheet data to file
+# ###################################################################################################################
+
+
+# ###################################################################################################################
+def getFilePath(iPath, iFile, iFileType, iCompress="no"):
+
+	import os
+	from os.path import expanduser
+	
+	vRoot = expanduser(iPath)
+	vFileName = str(iFile) + "." + str(iFileType)
+
+	if iCompress != "no" and iFileType not in gBinTypes:
+		vFileName = vFileName + "." + str(iCompress)
+
+	vFile = os.path.join(vRoot, vFileName)
+
+	return vFile
+
+
+# ###################################################################################################################
+def openFile(iFile, iCompress, iNewline=None):
+
+	# text goes directly to compressor, so there is no not compressed copy, 
+	# iNewline "" keeps line ends as written, e.g. for csv module
+	if iCompress == "gz":
+		import gzip
+		return gzip.open(iFile, 'wt', compresslevel=6, newline=iNewline)
+
+	if iCompress == "bz2":
+		import bz2
+		return bz2.open(iFile, 'wt', newline=iNewline)
+
+	if iCompress == "xz":
+		import lzma
+		return lzma.open(iFile, 'wt', newline=iNewline)
+
+	if iCompress != "no":
+		raise ValueError("unknown compression: " + str(iCompress))
+
+	return open(iFile, 'w', buffering=1048576, newline=iNewline)
+
+
+# ###################################################################################################################
+def getNewline(iEX):
+
+	# line end for CSV is set only by sLineCSV, also new lines in quoted cells are not changed
+	if iEX.sFileType == "csv":
+		return ""
+
+	return None
+
+
+# ###################################################################################################################
+def openStream(iEX, iFile):
+
+	# stream set from outside, write there, file types written from database have no stream
+	if iEX.stream != None or iEX.sFileType in gDBTypes:
+		return 0
+
+	iEX.file = iFile
+
+	if iEX.sFileType == "xlsx":
+		iEX.stream = XLSXopen(iEX, iFile)
+	else:
+		iEX.stream = openFile(iFile, iEX.sCompress, getNewline(iEX))
+
+
+# ###################################################################################################################
+def flushOUT(iEX):
+
+	# without stream the whole output stays in memory
+	if iEX.stream == None:
+		return 0
+
+	if iEX.db.stats == None:
+		iEX.stream.write("".join(iEX.out))
+	else:
+		writeTimed(iEX, iEX.stream, "".join(iEX.out))
+
+	# the same list, CSV writer writes to it
+	iEX.out.clear()
+
+
+# ###################################################################################################################
+def cancelOUT(iEX):
+
+	import os
+
+	# remove not finished file, without stream nothing was written yet
+	if iEX.stream != None and iEX.file != "":
+		iEX.stream.close()
+		iEX.stream = None
+		if iEX.zip != None:
+			iEX.zip.close()
+			iEX.zip = None
+		os.remove(iEX.file)
+		iEX.file = ""
+
+	iEX.out = []
+
+
+# ###################################################################################################################
+def saveToDisk(iEX, iFile):
+
+	# file types written directly from database
+	if iEX.sFileType in gDBTypes:
+
+		if iEX.db.stats == None:
+			selectSave(iEX, iFile)
+		else:
+			import time
+			start = time.perf_counter()
+			selectSave(iEX, iFile)
+			iEX.timeWrite = iEX.timeWrite + time.perf_counter() - start
+
+		setStatsFile(iEX, iFile)
+		return 0
+
+	# rows are in zip file with other workbook parts
+	if iEX.sFileType == "xlsx":
+		XLSXsave(iEX, iFile)
+		setStatsFile(iEX, iFile)
+		return 0
+
+	# rows have been already written to the stream
+	if iEX.stream != None:
+
+		flushOUT(iEX)
+
+		if iEX.file != "":
+			iEX.stream.close()
+			iEX.stream = None
+			setStatsFile(iEX, iEX.file)
+			iEX.file = ""
+
+		return 0
+
+	with openFile(iFile, iEX.sCompress, getNewline(iEX)) as vFH:
+		if iEX.db.stats == None:
+			vFH.write("".join(iEX.out))
+		else:
+			writeTimed(iEX, vFH, "".join(iEX.out))
+
+	setStatsFile(iEX, iFile)
+
+
+# ###################################################################################################################
+# Export cache
+# ###################################################################################################################
+
+
+# ###################################################################################################################
+def getCachePath(iPath):
+
+	import os
+	from os.path import expanduser
+
+	return os.path.join(expanduser(iPath), ".sheet2export.json")
+
+
+# ###################################################################################################################
+def loadCache(iPath):
+
+	import json
+
+	# files: exported file name gives content hash, export options and exported file checksum
+	# sources: FreeCAD file path gives Document.xml hash, export options and exported files names
+	try:
+		with open(getCachePath(iPath), 'r') as vFH:
+			vCache = json.load(vFH)
+		vCache["files"]
+		vCache["sources"]
+	except:
+		vCache = { "files": dict(), "sources": dict() }
+
+	return vCache
+
+
+# ###################################################################################################################
+def saveCache(iPath, iCache):
+
+	import os, json
+
+	# write to temporary file first, so broken write not remove the old cache
+	vFile = getCachePath(iPath)
+	with open(vFile + ".tmp", 'w') as vFH:
+		json.dump(iCache, vFH, indent=1, sort_keys=True)
+
+	os.replace(vFile + ".tmp", vFile)
+
+
+# ###################################################################################################################
+def getHash(iText):
+
+	import hashlib
+
+	return hashlib.sha256(iText.encode("utf-8")).hexdigest()
+
+
+# ###################################################################################################################
+def getFileHash(iFile):
+
+	import hashlib
+
+	vHash = hashlib.sha256()
+	with open(iFile, 'rb') as vFH:
+		for vData in iter(lambda: vFH.read(1048576), b""):
+			vHash.update(vData)
+
+	return vHash.hexdigest()
+
+
+# ###################################################################################################################
+def getCacheKey(iFile, iOptions, iLabel):
+
+	import os
+
+	# file with all spreadsheets of document has entry for each spreadsheet
+	if iLabel != "" and iOptions["sFileType"] in gDocTypes:
+		return os.path.basename(iFile) + " | " + iLabel
+
+	return os.path.basename(iFile)
+
+
+# ###################################################################################################################
+def isCached(iCache, iHash, iOptions, iFiles, iLabel=""):
+
+	import os
+
+	# all files have to be exported with the same content and options, and not changed later
+	for vOptions, vFile in zip(iOptions, iFiles):
+
+		vEntry = iCache["files"].get(getCacheKey(vFile, vOptions, iLabel))
+
+		if vEntry == None or vEntry["hash"] != iHash or vEntry["options"] != vOptions:
+			return False
+
+		if not os.path.isfile(vFile):
+			return False
+
+		if vEntry["checksum"] != None and getFileHash(vFile) != vEntry["checksum"]:
+			return False
+
+	return True
+
+
+# ###################################################################################################################
+def setCache(iCache, iHash, iOptions, iFiles, iLabel=""):
+
+	for vOptions, vFile in zip(iOptions, iFiles):
+
+		vEntry = dict()
+		vEntry["hash"] = iHash
+		vEntry["options"] = vOptions
+
+		# file with all spreadsheets of document is changed also by other spreadsheets
+		if vOptions["sFileType"] in gDocTypes:
+			vEntry["checksum"] = None
+		else:
+			vEntry["checksum"] = getFileHash(vFile)
+
+		iCache["files"][getCacheKey(vFile, vOptions, iLabel)] = vEntry
+
+
+# ###################################################################################################################
+# Export statistics
+# ###################################################################################################################
+
+
+# ###################################################################################################################
+def getTimed(iStats, iGetValue):
+
+	import time
+
+	# value getter with time measure, used only with statistics
+	def getValue(iKey):
+		start = time.perf_counter()
+		try:
+			return iGetValue(iKey)
+		finally:
+			iStats.get = iStats.get + time.perf_counter() - start
+
+	return getValue
+
+
+# ###################################################################################################################
+def writeTimed(iEX, iStream, iText):
+
+	import time
+
+	start = time.perf_counter()
+	iStream.write(iText)
+	iEX.timeWrite = iEX.timeWrite + time.perf_counter() - start
+	iEX.chars = iEX.chars + len(iText)
+
+
+# ###################################################################################################################
+def setStatsFile(iEX, iFile):
+
+	import os
+
+	if iEX.db.stats == None:
+		return 0
+
+	# bytes on disk can be different than characters, e.g. for compressed file
+	vFile = dict()
+	vFile["file"] = os.path.basename(iFile)
+	vFile["type"] = iEX.sFileType
+	vFile["write"] = round(iEX.timeWrite, 6)
+	vFile["empty"] = iEX.empty
+	vFile["chars"] = iEX.chars
+	vFile["bytes"] = os.path.getsize(iFile) if iFile != "" else iEX.chars
+
+	iEX.db.stats.files.append(vFile)
+
+
+# ###################################################################################################################
+def getStatsInfo(iStats):
+
+	# statistics as dict, e.g. for JSON report
+	vInfo = dict()
+	vInfo["sheet"] = iStats.label
+	vInfo["parse"] = round(iStats.parse, 6)
+	vInfo["get"] = round(iStats.get, 6)
+	vInfo["format"] = round(iStats.format, 6)
+	vInfo["write"] = round(sum([ f["write"] for f in iStats.files ]), 6)
+	vInfo["cells"] = iStats.cells
+	vInfo["empty"] = sum([ f["empty"] for f in iStats.files ])
+	vInfo["apiCalls"] = iStats.apiCalls
+	vInfo["apiSkip"] = iStats.apiSkip
+	vInfo["bytes"] = sum([ f["bytes"] for f in iStats.files ])
+	vInfo["files"] = iStats.files
+
+	return vInfo
+
+
+# ###################################################################################################################
+def showStats(iInfo):
+
+	info = "\n"
+	info += "( parse: %.3f s, get: %.3f s, format: %.3f s, write: %.3f s ) " % (iInfo["parse"], 
+		iInfo["get"], iInfo["format"], iInfo["write"])
+	info += "( cells: " + str(iInfo["cells"]) + ", empty: " + str(iInfo["empty"]) + ", "
+	info += "API calls: " + str(iInfo["apiCalls"]) + ", avoided: " + str(iInfo["apiSkip"]) + ", "
+	info += "bytes: " + str(iInfo["bytes"]) + " ) "
+
+	printMsg(info)
+
+
+# ###################################################################################################################
+def saveStats(iPath, iDocument, iAll):
+
+	import os, json, time
+	from os.path import expanduser
+
+	vReport = dict()
+	vReport["document"] = iDocument
+	vReport["date"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+	vReport["sheets"] = iAll
+
+	vFile = os.path.join(expanduser(iPath), "sheet2export.stats.json")
+	with open(vFile, 'w') as vFH:
+		json.dump(vReport, vFH, indent=1)
+
+	return vFile
+
+
+# ###################################################################################################################
+# Export API
+# ###################################################################################################################
+
+
+# ###################################################################################################################
+def getExports(iDB, iOptions):
+
+	# export for each options, e.g. for each file type, all of them use the same database
+	vEXs = []
+
+	for vOptions in iOptions:
+		vEX = Export(vOptions)
+		vEX.db = iDB
+		vEXs.append(vEX)
+
+	return vEXs
+
+
+# ###################################################################################################################
+def exportDB(iDB, iOptions, iFiles, iLabel=""):
+
+	# export database to files, the database is walked once for all files, 
+	# iLabel is spreadsheet label for file types with all spreadsheets in one file
+	vEXs = getExports(iDB, iOptions)
+	for vEX in vEXs:
+		vEX.label = iLabel
+
+	for vEX, vFile in zip(vEXs, iFiles):
+		if vEX.sStreamOUT == "yes":
+			openStream(vEX, vFile)
+
+	setOUTPUT(vEXs)
+
+	for vEX, vFile in zip(vEXs, iFiles):
+		saveToDisk(vEX, vFile)
+
+	return vEXs
+
+
+# ###################################################################################################################
+def exportSheet(iCells, iStream, iOptions=None, iGetValue=None, iStats=None):
+
+	# export spreadsheet cells to the stream without FreeCAD or GUI, 
+	# iCells is the spreadsheet cells.Content XML or iterator of cell attributes, 
+	# iStream is any object with write() method, iGetValue(key) gives calculated cell value, 
+	# without it the XML content is written for formulas and numbers, 
+	# iStats is Stats object to fill with time of each phase and counters
+	vEX = Export(iOptions)
+	vEX.stream = iStream
+	vEX.db.stats = iStats
+
+	if vEX.sFileType in gBinTypes:
+		raise ValueError("file type can not be written to stream: " + str(vEX.sFileType))
+
+	setDB(vEX.db, iCells, iGetValue)
+	setOUTPUT(vEX)
+	setStatsFile(vEX, "")
+
+	return vEX
+
+
+# ###################################################################################################################
+# Parallel export
+# ###################################################################################################################
+
+
+# ###################################################################################################################
+def getFileTypes():
+
+	# one file type or list of file types
+	if isinstance(sFileType, str):
+		return [ sFileType ]
+
+	return list(sFileType)
+
+
+# ###################################################################################################################
+def getOptions():
+
+	# current settings for each file type, worker process has only default settings from file
+	vAll = []
+
+	for vFileType in getFileTypes():
+
+		vOptions = dict()
+		vOptions["sFileType"] = vFileType
+		vOptions["sSepCSV"] = sSepCSV
+		vOptions["sQuoteCSV"] = sQuoteCSV
+		vOptions["sLineCSV"] = sLineCSV
+		vOptions["sCustomCSS"] = sCustomCSS
+		vOptions["sCSSclass"] = sCSSclass
+		vOptions["sStreamOUT"] = sStreamOUT
+		vOptions["sCompact"] = sCompact
+		vOptions["sCompress"] = sCompress
+
+		# html space is not for other file types, they get empty cell for file type
+		if vFileType == "html" or sEmptyCell != "&nbsp;":
+			vOptions["sEmptyCell"] = sEmptyCell
+
+		vAll.append(vOptions)
+
+	return vAll
+
+
+# ###################################################################################################################
+def getModule():
+
+	import os, sys, importlib
+
+	# worker process gets functions by module name, this file run as macro 
+	# or script is __main__ module, so it has to be imported by its name
+	vDir = os.path.dirname(os.path.abspath(__file__))
+	if vDir not in sys.path:
+		sys.path.insert(0, vDir)
+
+	return importlib.import_module(os.path.splitext(os.path.basename(__file__))[0])
+
+
+# ###################################################################################################################
+def getPool(iJobs, iTasks):
+
+	import os, sys, multiprocessing
+	from concurrent.futures import ProcessPoolExecutor
+
+	if iJobs < 1:
+		iJobs = os.cpu_count() or 1
+
+	# Qt application should not be forked, so new python process is started for each worker
+	vContext = multiprocessing.get_context("spawn")
+
+	# inside FreeCAD the executable is FreeCAD not python, so use python installed with FreeCAD
+	if FreeCAD != None:
+		vDir = os.path.dirname(sys.executable)
+		for vName in ("python.exe", "python3", "python"):
+			if os.path.isfile(os.path.join(vDir, vName)):
+				vContext.set_executable(os.path.join(vDir, vName))
+				break
+
+	return ProcessPoolExecutor(max_workers=min(iJobs, iTasks), mp_context=vContext)
+
+
+# ###################################################################################################################
+def runJob(iJob):
+
+	# export in worker process, cell values calculated by FreeCAD are given in dict, 
+	# the statistics are returned as dict, the value getter time is measured by FreeCAD process
+	vCells, vValues, vOptions, vFiles, vStats, vLabel = iJob
+
+	vDB = SheetDB()
+	if vStats != None:
+		vDB.stats = Stats(vStats["sheet"])
+
+	setDB(vDB, vCells, vValues.__getitem__)
+
+	exportDB(vDB, vOptions, vFiles, vLabel)
+
+	if vStats != None:
+		vDB.stats.get = vStats["get"]
+		return vFiles, getStatsInfo(vDB.stats)
+
+	return vFiles, None
+
+
+# ###################################################################################################################
+# Batch export from FreeCAD files
+# ###################################################################################################################
+
+
+# ###################################################################################################################
+def iterFCStd(iFile):
+
+	import zipfile
+	import xml.etree.ElementTree as ET
+
+	# FreeCAD file is zip archive with Document.xml inside, the spreadsheet cells are stored 
+	# in cells property of each Spreadsheet::Sheet object, the XML is parsed in parts and 
+	# each finished element is removed, so only one spreadsheet database is in memory
+	vParser = ET.XMLPullParser(events=("start", "end"))
+	vStack = []
+	vDocLabel = ""
+	vLabel = ""
+	vProp = ""
+	vDB = None
+
+	with zipfile.ZipFile(iFile) as vZip:
+		with vZip.open("Document.xml") as vXML:
+
+			while True:
+
+				vData = vXML.read(65536)
+				if vData:
+					vParser.feed(vData)
+				else:
+					vParser.close()
+
+				for vEvent, vElem in vParser.read_events():
+
+					if vEvent == "start":
+
+						vStack.append(vElem)
+
+						if vElem.tag == "Property":
+							vProp = vElem.get("name")
+							if vElem.get("type") == "Spreadsheet::PropertySheet":
+								vDB = SheetDB()
+
+						# object data, only sheets have cells property
+						if vElem.tag == "Object" and len(vStack) > 2 and vStack[-2].tag == "ObjectData":
+							vLabel = vElem.get("name")
+							vDB = None
+
+						if vElem.tag == "String" and vProp == "Label":
+
+							# document label is at the begin, before any object
+							if len(vStack) == 4:
+								vDocLabel = vElem.get("value")
+							else:
+								vLabel = vElem.get("value")
+
+						continue
+
+					vStack.pop()
+
+					if vElem.tag == "Cell" and vDB != None:
+						setDBcell(vDB, vElem.attrib)
+
+					if vElem.tag == "Property":
+						vProp = ""
+
+					# sheet object finished, label and cells are known
+					if vElem.tag == "Object" and vDB != None:
+
+						setDBend(vDB)
+
+						yield vDocLabel, vLabel, vDB
+						vDB = None
+
+					# remove finished element, it is always the last child
+					if len(vStack) > 0 and len(vStack[-1]) > 0 and vStack[-1][-1] is vElem:
+						del vStack[-1][-1]
+
+				if not vData:
+					break
+
+
+# ###################################################################################################################
+def getFCStdFiles(iPaths):
+
+	import os
+
+	# given files and all FreeCAD files in given folders
+	vFiles = []
+
+	for vPath in iPaths:
+
+		if os.path.isdir(vPath):
+			for vRoot, vDirs, vNames in os.walk(vPath):
+				vDirs.sort()
+				for vName in sorted(vNames):
+					if vName.lower().endswith(".fcstd"):
+						vFiles.append(os.path.join(vRoot, vName))
+		else:
+			vFiles.append(vPath)
+
+	return vFiles
+
+
+# ###################################################################################################################
+def getFCStdHash(iPath):
+
+	import zipfile
+
+	# CRC and size of Document.xml are stored in zip directory, so there is no need to read it
+	with zipfile.ZipFile(iPath) as vZip:
+		vInfo = vZip.getinfo("Document.xml")
+
+	return "%08x-%d" % (vInfo.CRC, vInfo.file_size)
+
+
+# ###################################################################################################################
+def getCachePart(iCache, iPath):
+
+	import os
+
+	# cache part for given FreeCAD file only, it is sent to worker process
+	if iCache == None:
+		return None
+
+	vPath = os.path.abspath(iPath)
+	vPart = { "files": dict(), "sources": dict() }
+	vSource = iCache["sources"].get(vPath)
+
+	if vSource != None:
+		vPart["sources"][vPath] = vSource
+		for f in vSource["files"]:
+			if f in iCache["files"]:
+				vPart["files"][f] = iCache["files"][f]
+
+	return vPart
+
+
+# ###################################################################################################################
+def exportFCStd(iPath, iOptions, iOut, iCache=None):
 
-	# search keys also in background db
-	# this can be page separator line using background color
-	for k in dbCPB.keys():
-		
-		# split spreadsheet key to word and number
-		res = [re.findall(r'(\w+?)(\d+)', str(k))[0] ]
+	import os
 
-		w = str(res[0][0]) # word column
-		n = int(res[0][1]) # number rows
-		
-		if int(dbSKV[w]) > int(dbMaxC):
-			dbMaxC = int(dbSKV[w])
-		
-		if int(n) > int(dbMaxR):
-			dbMaxR = int(n)
-	
+	vAll = []
 
-# ###################################################################################################################
-def resetDB():
+	# skip FreeCAD file not changed since last export, cache is given as part for this file, 
+	# because worker process can't change it, the new part is returned instead
+	if iCache != None:
+
+		vPath = os.path.abspath(iPath)
+		vHash = getFCStdHash(iPath)
+		vSource = iCache["sources"].get(vPath)
+
+		if vSource != None and vSource["hash"] == vHash and vSource["options"] == iOptions:
+
+			vFiles = [ os.path.join(os.path.expanduser(iOut), f) for f in vSource["files"] ]
+			vOptions = dict()
+			for vFile in vFiles:
+				vEntry = iCache["files"].get(os.path.basename(vFile))
+				if vEntry != None:
+					vOptions[vFile] = vEntry["options"]
+
+			if len(vOptions) == len(vFiles):
+				if isCached(iCache, vHash, [ vOptions[f] for f in vFiles ], vFiles):
+					return vFiles, True, iCache
+
+		vCache = { "files": dict(), "sources": dict() }
+
+	for vDocLabel, vLabel, vDB in iterFCStd(iPath):
+
+		# the same file names as for macro
+		vFiles = []
+		for vOptions in iOptions:
+			if vOptions["sFileType"] in gDocTypes:
+				vFiles.append(getFilePath(iOut, vDocLabel, vOptions["sFileType"]))
+			else:
+				vFiles.append(getFilePath(iOut, vDocLabel + " - " + vLabel, vOptions["sFileType"], vOptions.get("sCompress", "no")))
+
+		exportDB(vDB, iOptions, vFiles, vLabel)
+
+		if iCache != None:
+			setCache(vCache, vHash, iOptions, vFiles)
+
+		vAll.extend([ f for f in vFiles if f not in vAll ])
+
+	if iCache != None:
+		vCache["sources"][vPath] = { "hash": vHash, "options": iOptions, 
+			"files": [ os.path.basename(f) for f in vAll ] }
+		return vAll, False, vCache
+
+	return vAll, False, None
+
+
+# ###################################################################################################################
+def runBatch(iArgs):
+
+	import argparse
+
+	vParser = argparse.ArgumentParser(prog="sheet2export", 
+		description="Export spreadsheets from FreeCAD files without FreeCAD. There is no recompute, "
+		+ "so cells with formulas are exported as formula text, e.g. =A1+B1, not as calculated value. "
+		+ "To export calculated values, run the macro in FreeCAD.")
+	vParser.add_argument("paths", nargs="+", metavar="PATH", 
+		help="FreeCAD .FCStd file or folder with .FCStd files")
+	vParser.add_argument("-t", "--type", default=getFileTypes(), choices=("csv", "html", "json", "md", "sqlite", "npz", "xlsx"), nargs="+", 
+		help="export file types, the file is read once for all of them, default: %(default)s")
+	vParser.add_argument("-o", "--out", default=sFilePath, 
+		help="folder for exported files, default: %(default)s")
+	vParser.add_argument("-e", "--empty", default=None, 
+		help="empty cell content, default: &nbsp; for html and nothing for other types")
+	vParser.add_argument("-s", "--sep", default=sSepCSV, 
+		help="CSV separator, default: %(default)s")
+	vParser.add_argument("-q", "--quote", default=sQuoteCSV, choices=("minimal", "all", "none"), 
+		help="CSV quoting, default: %(default)s")
+	vParser.add_argument("-z", "--compress", default=sCompress, choices=("no", "gz", "bz2", "xz"), 
+		help="compression of exported files, default: %(default)s")
+	vParser.add_argument("--compact", action="store_true", default=(sCompact == "yes"), 
+		help="html empty cells joined with colspan, csv and md without empty cells at the end of row")
+	vParser.add_argument("--css-class", action="store_true", default=(sCSSclass == "yes"), 
+		help="html with CSS classes in <STYLE> block instead of inline style for each cell")
+	vParser.add_argument("-j", "--jobs", default=sJobs, type=int, 
+		help="number of worker processes, 0 for one for each CPU core, default: %(default)s")
+	vParser.add_argument("-c", "--cache", action="store_true", default=(sCache == "yes"), 
+		help="skip FreeCAD files not changed since last export, see .sheet2export.json in export folder")
+	vArgs = vParser.parse_args(iArgs)
+
+	vOptions = []
+	for vFileType in vArgs.type:
+		vOptions.append({ "sFileType": vFileType, "sSepCSV": vArgs.sep or ",", "sQuoteCSV": vArgs.quote, 
+			"sCSSclass": "yes" if vArgs.css_class else "no", "sCompact": "yes" if vArgs.compact else "no", 
+			"sCompress": vArgs.compress })
+		if vArgs.empty != None:
+			vOptions[-1]["sEmptyCell"] = vArgs.empty
+
+	vErrors = 0
+	vSkipped = 0
+	vPaths = getFCStdFiles(vArgs.paths)
+	vResults = []
+	vIndex = [] # files with all spreadsheets of document, indexed at the end
+
+	vCache = None
+	if vArgs.cache:
+		vCache = loadCache(vArgs.out)
+
+	# each FreeCAD file is exported by worker process, results are printed in the given order
+	if vArgs.jobs != 1 and len(vPaths) > 1:
+		vS = getModule()
+		vPool = getPool(vArgs.jobs, len(vPaths))
+		for vPath in vPaths:
+			vResults.append(vPool.submit(vS.exportFCStd, vPath, vOptions, vArgs.out, getCachePart(vCache, vPath)))
+	else:
+		vPool = None
+		vResults = vPaths
+
+	for vPath, vResult in zip(vPaths, vResults):
+
+		try:
+			if vPool != None:
+				vFiles, vSkip, vPart = vResult.result()
+			else:
+				vFiles, vSkip, vPart = exportFCStd(vPath, vOptions, vArgs.out, getCachePart(vCache, vPath))
+
+			if vSkip:
+				vSkipped = vSkipped + 1
+				printMsg("not changed, skipped: " + str(vPath) + "\n")
+				continue
 
-	# reset db
-	global dbCPC
-	global dbCPA
-	global dbCPS
-	global dbCPB
-	global dbCPRS
-	global dbCPCS
+			if vPart != None:
+				vCache["files"].update(vPart["files"])
+				vCache["sources"].update(vPart["sources"])
 
-	dbCPC.clear() # content
-	dbCPA.clear() # alignment
-	dbCPS.clear() # style
-	dbCPB.clear() # background
-	dbCPRS.clear() # row span
-	dbCPCS.clear() # column span
+			for vFile in vFiles:
+				printMsg(vFile + "\n")
+				if vFile.endswith(".sqlite") and vFile not in vIndex:
+					vIndex.append(vFile)
 
-	# reset output
-	global gOUT
+		except Exception as e:
+			vErrors = vErrors + 1
+			printMsg("ERROR: " + str(vPath) + " | " + str(e) + "\n")
 
-	gOUT = ""
+	if vPool != None:
+		vPool.shutdown()
 
-	# max
-	global dbMaxR
-	global dbMaxC
+	for vFile in vIndex:
+		try:
+			SQLITEindex(vFile)
+		except Exception as e:
+			vErrors = vErrors + 1
+			printMsg("ERROR: " + str(vFile) + " | " + str(e) + "\n")
+
+	if vCache != None:
+		saveCache(vArgs.out, vCache)
+		printMsg("FreeCAD files: " + str(len(vPaths)) + ", not changed: " + str(vSkipped) + "\n")
 
-	dbMaxR = 0 # row
-	dbMaxC = 0 # column
+	if vErrors > 0:
+		return 1
+
+	return 0
 
 
 # ###################################################################################################################
-# File format selector
+# Export time estimate
 # ###################################################################################################################
 
 
 # ###################################################################################################################
-def selectBegin():
-
-	if sFileType == "csv":
-		CSVbegin()
+def getModelPath():
 
-	if sFileType == "html":
-		HTMLbegin()
+	import os
+	from os.path import expanduser
 
-	if sFileType == "json":
-		JSONbegin()
+	# local file, the speed depends on computer not on exported document
+	if FreeCAD != None:
+		return os.path.join(FreeCAD.getUserAppDataDir(), "sheet2export.model.json")
 
-	if sFileType == "md":
-		MDbegin()
+	return os.path.join(expanduser("~"), ".sheet2export.model.json")
 
 
 # ###################################################################################################################
-def selectEnd():
-
-	if sFileType == "csv":
-		CSVend()
+def loadModel():
 
-	if sFileType == "html":
-		HTMLend()
+	import json
 
-	if sFileType == "json":
-		JSONend()
+	# export speed in cost units per second for each file types and compression
+	try:
+		with open(getModelPath(), 'r') as vFH:
+			vModel = json.load(vFH)
+		dict(vModel)
+	except:
+		vModel = dict()
 
-	if sFileType == "md":
-		MDend()
+	return vModel
 
 
 # ###################################################################################################################
-def selectRowOpen():
+def saveModel(iModel):
+
+	import json
+
+	try:
+		with open(getModelPath(), 'w') as vFH:
+			json.dump(iModel, vFH, indent=1, sort_keys=True)
+	except:
+		skip = 1
 
-	if sFileType == "csv":
-		CSVrowOpen()
 
-	if sFileType == "html":
-		HTMLrowOpen()
+# ###################################################################################################################
+def getModelKey():
 
-	if sFileType == "json":
-		JSONrowOpen()
+	vKey = "+".join(getFileTypes())
+	if sCompress != "no":
+		vKey = vKey + "." + sCompress
 
-	if sFileType == "md":
-		MDrowOpen()
+	return vKey
 
 
 # ###################################################################################################################
-def selectRowClose():
+def getCost(iCells):
+
+	# cost units from spreadsheet XML without parse, each stored cell is one unit, 
+	# formula needs FreeCAD API call and span changes the table layout, so they cost more
+	vCells = iCells.count("<Cell ")
+	vFormulas = iCells.count('content="=')
+	vSpans = iCells.count("colSpan=")
 
-	if sFileType == "csv":
-		CSVrowClose()
+	return vCells + 20 * vFormulas + 5 * vSpans
 
-	if sFileType == "html":
-		HTMLrowClose()
 
-	if sFileType == "json":
-		JSONrowClose()
+# ###################################################################################################################
+def getEstimate(iModel, iCost):
 
-	if sFileType == "md":
-		MDrowClose()
+	# speed measured before or slow default for first export
+	return iCost / iModel.get(getModelKey(), 20000)
 
 
 # ###################################################################################################################
-def selectEmpty(iKey, iC, iR):
+def setModel(iModel, iCost, iTime):
 
-	if sFileType == "csv":
-		CSVempty(iKey, iC, iR)
+	# too short time is mostly noise
+	if iTime < 0.05:
+		return 0
 
-	if sFileType == "html":
-		HTMLempty(iKey, iC, iR)
+	# new speed changes the model only partly, so single slow export not breaks it
+	vKey = getModelKey()
+	vSpeed = iCost / iTime
 
-	if sFileType == "json":
-		JSONempty(iKey, iC, iR)
+	if vKey in iModel:
+		iModel[vKey] = 0.7 * iModel[vKey] + 0.3 * vSpeed
+	else:
+		iModel[vKey] = vSpeed
 
-	if sFileType == "md":
-		MDempty(iKey, iC, iR)
 
+# ###################################################################################################################
+# MAIN TASKS
+# ###################################################################################################################
 
 # ###################################################################################################################
-def selectCell(iKey, iCell, iC, iR):
+def askForExport(iSheets):
 
-	if sFileType == "csv":
-		CSVcell(iKey, iCell, iC, iR)
+	global gModel
 
-	if sFileType == "html":
-		HTMLcell(iKey, iCell, iC, iR)
+	if sQT != "yes" or sBudget <= 0 or len(iSheets) == 0:
+		return "yes"
 
-	if sFileType == "json":
-		JSONcell(iKey, iCell, iC, iR)
+	if gModel == None:
+		gModel = loadModel()
 
-	if sFileType == "md":
-		MDcell(iKey, iCell, iC, iR)
+	# one question for all spreadsheets
+	vTime = getEstimate(gModel, sum([ getCost(vSheet.cells.Content) for vSheet in iSheets ]))
+	if vTime <= sBudget:
+		return "yes"
 
+	from PySide import QtGui
 
-# ###################################################################################################################
-# Set output
-# ###################################################################################################################
+	info = ""
+	if len(iSheets) == 1:
+		info += translate('sheet2export', 'The spreadsheet') + ' ' + str(iSheets[0].Label)
+	else:
+		info += str(len(iSheets)) + ' ' + translate('sheet2export', 'spreadsheets')
+	info += "\n\n"
+	info += translate('sheet2export', 'Estimated export time') + ': ' + str(int(vTime)) + ' s'
+	if vTime >= 120:
+		info += ' ( ' + str(int(vTime / 60)) + ' min )'
+	info += "\n\n"
+	info += translate('sheet2export', 'Would you like to wait (ok) or skip (cancel) the export?') + '\t\t'
+	info += "\n\n"
+	reply = QtGui.QMessageBox.question(None, "", str(info), 
+		QtGui.QMessageBox.Yes | QtGui.QMessageBox.No, QtGui.QMessageBox.No)
+
+	if reply == QtGui.QMessageBox.No:
+		return "no"
+
+	return "yes"
 
 
 # ###################################################################################################################
-def setOUTPUT():
+def getCacheHash(iCells):
 
-	if sQT == "yes":
-		if int(dbMaxR * dbMaxC) > 10000:
-
-			info = ""
-			info += translate('sheet2export', 'The spreadsheet') + ' ' + str(gSheet.Label)
-			info += ' ' + translate('sheet2export', 'has') + ':' + ' ' + '\n\n'
-			info += str(dbMaxC) + ' ' + translate('sheet2export', 'columns') + '\n'
-			info += str(dbMaxR) + ' ' + translate('sheet2export', 'rows') + '\n'
-			info += "\n"
-			info += translate('sheet2export', 'This may take several minutes to export file.')
-			info += "\n"
-			info += translate('sheet2export', 'Would you like to wait (ok) or skip (cancel) the spreadsheet?') + '\t\t'
-			info += "\n\n"
-			reply = QtGui.QMessageBox.question(None, "", str(info), 
-				QtGui.QMessageBox.Yes | QtGui.QMessageBox.No, QtGui.QMessageBox.No)
-			
-			if reply == QtGui.QMessageBox.Yes:
-				skip = 0
+	# spreadsheet with formulas can be changed by other objects, so it is always exported
+	if gCache == None or 'content="=' in iCells:
+		return None
 
-			if reply == QtGui.QMessageBox.No:
-				skip = 1
-				return -1
-	
-	# set begin of the spreadsheet table
-	selectBegin()
-	
-	# set variables for loop
-	colSpan = 0
-	rowSpan = 0
-	vCell = ""
-	c = 1
-	r = 1
-	
-	# just simple walk thru the matrix and setting each cell
-	while r <= dbMaxR:
+	return getHash(iCells)
 
-		FreeCAD.Console.PrintMessage(".")
-		FreeCAD.Console.PrintMessage("")
 
-		# set row extra properties
-		selectRowOpen()
-		
-		# go thru columns for given row
-		while c <= dbMaxC:
+# ###################################################################################################################
+def isSkipped(iHash):
 
-			# get access point
-			vKey = str(dbSKL[str(c)]) + str(r)
+	global gSkipFilesN, gFormulaN
 
-			try:
+	# spreadsheet with formulas has no cache hash, so user should know why it is exported again
+	if gCache != None and iHash == None:
+		gFormulaN += gSheet.Label + "\t\n"
 
-				# get content
-				vCell = str(dbCPC[vKey])
+	if iHash == None or not isCached(gCache, iHash, getOptions(), getFiles(), gSheet.Label):
+		return False
 
-				# set colspan before you set the cell
-				try:
-					colSpan = int(dbCPCS[vKey])
-					rowSpan = int(dbCPRS[vKey])
-				except:
-					skip = 1
+	for vFile in getFiles():
+		if vFile + "\t\n" not in gSkipFilesN:
+			gSkipFilesN += vFile + "\t\n"
 
-				# set the cell content
-				if vCell != "":
-					selectCell(vKey, vCell, c, r)
-				else:
-					selectEmpty(vKey, c, r)
+	printMsg("not changed, skipped.")
 
-			except:
+	return True
 
-				# if there was no such cell access point it will be empty cell
-				# if there is open colspan this should be skipped
-				if sFileType == "html":
-					if colSpan == 0 or rowSpan == 0:
-						selectEmpty(vKey, c, r)
 
-				# colspan is not supported by the file type
-				else:
-					selectEmpty(vKey, c, r)
+# ###################################################################################################################
+def showSummary(iBox="yes"):
 
-			# fix if there is empty row separator
-			if sFileType == "html":
-				cls = ""
-				try:
-					cls = int(dbCPCS[vKey])
-				except:
-					skip = 1
-				
-				if cls == int(dbMaxC):
-					c = int(dbMaxC)
-					
-			# if the cell was written and there is colspan open
-			if colSpan > 0:
-				colSpan = colSpan - 1 
-		
-			# just go to next column
-			c = c + 1
+	# index for file with all spreadsheets of document is created once, after all of them are written
+	for vFile in gExpFilesN.split("\t\n"):
+		if vFile.endswith(".sqlite"):
+			try:
+				SQLITEindex(vFile)
+			except:
+				showError(gAD, "SQLITEindex", "Index is not created.")
 
-		# add extra close row properties
-		selectRowClose()
-		
-		if rowSpan > 0:
-			rowSpan = rowSpan - 1
+	if gCache != None:
+		saveCache(sFilePath, gCache)
 
-		# set variables for next row
-		c = 1
-		r = r + 1
+	if gModel != None:
+		saveModel(gModel)
 
-	# set end of the spreadsheet table
-	selectEnd()
+	if sStats == "json" and len(gStats) > 0:
+		printMsg("\n" + translate('sheet2export', 'Statistics') + ": " + saveStats(sFilePath, gAD.Label, gStats) + "\n")
 
-	# set info
-	FreeCAD.Console.PrintMessage("done.")
+	info = ""
+	info += translate('sheet2export', 'Exported files')
+	info += ": \n\n" + str(gExpFilesN) + "\n\n"
 
+	# file with all spreadsheets of document can be skipped for one spreadsheet and written for other
+	vSkipFilesN = ""
+	for vFile in gSkipFilesN.split("\t\n"):
+		if vFile != "" and vFile + "\t\n" not in gExpFilesN:
+			vSkipFilesN += vFile + "\t\n"
 
-# ###################################################################################################################
-# Save spreadsheet data to file
-# ###################################################################################################################
+	if vSkipFilesN != "":
+		info += translate('sheet2export', 'Not changed files, skipped')
+		info += ": \n\n" + str(vSkipFilesN) + "\n\n"
+
+	if gFormulaN != "":
+		info += translate('sheet2export', 'Spreadsheets with formulas, exported always')
+		info += ": \n\n" + str(gFormulaN) + "\n\n"
+
+	# watch mode exports after each change, so there is no box to close each time
+	if iBox == "yes":
+		showInfo(info)
+	else:
+		printMsg(gSepC)
+		printMsg(str(info))
+		printMsg(gSepC)
 
 
 # ###################################################################################################################
-def saveToDisk():
+def getFiles():
 
-	global gExpFilesN
+	# output file for each file type
+	vFiles = []
 
-	import os, sys
-	from os.path import expanduser
-	
-	vRoot = expanduser(sFilePath)
-	vFileName = str(gFile) + "." + str(sFileType)
-	vFile = os.path.join(vRoot, vFileName)
-	
-	with open(vFile, 'w') as vFH:
-		vFH.write("%s" % gOUT)
+	for vFileType in getFileTypes():
+		if vFileType in gDocTypes:
+			vFiles.append(getFilePath(sFilePath, gAD.Label, vFileType))
+		else:
+			vFiles.append(getFilePath(sFilePath, gFile, vFileType, sCompress))
 
-	gExpFilesN += vFile + "\t\n"
+	return vFiles
 
 
 # ###################################################################################################################
-# MAIN TASKS
-# ###################################################################################################################
+def setExpFile(iFile):
+
+	global gExpFilesN
+
+	# file with all spreadsheets of document is shown once
+	if iFile + "\t\n" not in gExpFilesN:
+		gExpFilesN += iFile + "\t\n"
+
 
 # ###################################################################################################################
 def runTasks():
 
+	import time
+
+	global gModel
+
+	vCells = gSheet.cells.Content
+
+	# skip spreadsheet not changed since last export
+	vHash = getCacheHash(vCells)
+	if isSkipped(vHash):
+		return 0
+
+	start = time.perf_counter()
+
+	vDB = SheetDB()
+	if sStats != "no":
+		vDB.stats = Stats(gSheet.Label)
+
 	try:
-		setDB()
+		setDB(vDB, vCells, gSheet.get)
 	except:
 		showError(gSheet, "setDB" , "Databese is not set correctly.")
-		
+
+	# export for each file type, the spreadsheet is read only once
+	vEXs = getExports(vDB, getOptions())
+	vFiles = getFiles()
+	for vEX in vEXs:
+		vEX.label = gSheet.Label
+	vProgress = Progress(gSheet.Label, vDB.maxR)
+	vEXs[0].progress = vProgress.update
+
 	try:
-		if setOUTPUT() == -1:
-			return 0
+		# open output file for rows
+		for vEX, vFile in zip(vEXs, vFiles):
+			if vEX.sStreamOUT == "yes":
+				openStream(vEX, vFile)
+
+		vDone = setOUTPUT(vEXs)
 	except:
+		vDone = "yes"
 		showError(gSheet, "setOUTPUT" , "Output is not set correctly.")
+
+	vProgress.close()
+
+	# canceled by user, not finished files are removed
+	if vDone == "no":
+		for vEX in vEXs:
+			cancelOUT(vEX)
+		printMsg(" canceled.")
+		return 0
+
+	printMsg(" done.")
 		
 	try:	
-		saveToDisk()
+		for vEX, vFile in zip(vEXs, vFiles):
+			saveToDisk(vEX, vFile)
+			setExpFile(vFile)
+
+		if vHash != None:
+			setCache(gCache, vHash, getOptions(), vFiles, gSheet.Label)
 	except:
 		showError(gSheet, "saveToDisk" , "File is not exported correctly.")
 
+	# export speed for next time estimate, other export modes run in parallel, so only here
+	if sBudget > 0:
+		if gModel == None:
+			gModel = loadModel()
+		setModel(gModel, getCost(vCells), time.perf_counter() - start)
+
+	if vDB.stats != None:
+		vInfo = getStatsInfo(vDB.stats)
+		gStats.append(vInfo)
+		showStats(vInfo)
+
+
+# ###################################################################################################################
+def getJob():
+
+	# FreeCAD objects can be used only in FreeCAD process, so here are taken cell values 
+	# calculated by FreeCAD, parse and export is done later by worker process
+	vCells = gSheet.cells.Content
+	vValues = dict()
+	vStats = None
+	vGetValue = gSheet.get
+
+	# skip spreadsheet not changed since last export
+	if isSkipped(getCacheHash(vCells)):
+		return None
+
+	if sStats != "no":
+		vStats = Stats(gSheet.Label)
+		vGetValue = getTimed(vStats, vGetValue)
+
+	for root2 in iterCells(vCells):
+
+		try:
+			key = root2["address"]
+		except:
+			continue
+
+		vValue = getLiteral(root2.get("content"))
+
+		if vValue == None and "content" in root2:
+			try:
+				# numbers keep type for file types with number cells, other values as text, e.g. quantity
+				vValue = vGetValue(key)
+				if type(vValue) not in ( int, float ):
+					vValue = str(vValue)
+				vValues[key] = vValue
+			except:
+				skip = 1
+
+	if vStats != None:
+		vStats = { "sheet": vStats.label, "get": vStats.get }
+
+	return ( vCells, vValues, getOptions(), getFiles(), vStats, gSheet.Label )
+
+
+# ###################################################################################################################
+def runJobs(iSheets, iJobs):
+
+	vS = getModule()
+	vPool = getPool(sJobs, len(iJobs))
+	vResults = [ vPool.submit(vS.runJob, vJob) for vJob in iJobs ]
+
+	# results in document order
+	for vSheet, vJob, vResult in zip(iSheets, iJobs, vResults):
+		try:
+			vFiles, vInfo = vResult.result()
+			for vFile in vFiles:
+				setExpFile(vFile)
+
+			if vInfo != None:
+				gStats.append(vInfo)
+				printMsg("\n" + str(vInfo["sheet"]) + " ")
+				showStats(vInfo)
+
+			vHash = getCacheHash(vJob[0])
+			if vHash != None:
+				setCache(gCache, vHash, vJob[2], vJob[3], vJob[5])
+		except:
+			showError(vSheet, "runJob" , "File is not exported correctly.")
+
+	vPool.shutdown()
+
+
+# ###################################################################################################################
+def runBackground(iSheets, iJobs, iDone=None):
+
+	import threading
+	import FreeCADGui
+	from PySide import QtCore
+
+	# ############################################################################
+	# Qt Background Class
+	# ############################################################################
+
+	# the jobs have only data taken from FreeCAD, so they can be exported in other thread, 
+	# results come back by signals to the GUI thread, where globals and cache are changed
+	class QtBackgroundClass(QtCore.QObject):
+
+		jobDone = QtCore.Signal(int, object)
+		jobError = QtCore.Signal(int, str)
+		allDone = QtCore.Signal()
+
+		def __init__(self):
+			super(QtBackgroundClass, self).__init__(FreeCADGui.getMainWindow())
+			self.jobDone.connect(self.setJobDone)
+			self.jobError.connect(self.setJobError)
+			self.allDone.connect(self.setAllDone)
+
+		# worker thread
+		def run(self):
+
+			vPool = None
+			if sJobs != 1:
+				vS = getModule()
+				vPool = getPool(sJobs, len(iJobs))
+				vResults = [ vPool.submit(vS.runJob, vJob) for vJob in iJobs ]
+
+			for i, vJob in enumerate(iJobs):
+				try:
+					if vPool != None:
+						self.jobDone.emit(i, vResults[i].result())
+					else:
+						self.jobDone.emit(i, runJob(vJob))
+				except Exception as e:
+					self.jobError.emit(i, str(e))
+
+			if vPool != None:
+				vPool.shutdown()
+
+			self.allDone.emit()
+
+		# GUI thread
+		@QtCore.Slot(int, object)
+		def setJobDone(self, i, iResult):
+
+			vFiles, vInfo = iResult
+			for vFile in vFiles:
+				setExpFile(vFile)
+
+			printMsg("\n" + translate('sheet2export', 'Exported in background') + ": " + str(iSheets[i].Label) + " ")
+
+			if vInfo != None:
+				gStats.append(vInfo)
+				showStats(vInfo)
+
+			vHash = getCacheHash(iJobs[i][0])
+			if vHash != None:
+				setCache(gCache, vHash, iJobs[i][2], iJobs[i][3], iJobs[i][5])
+
+		@QtCore.Slot(int, str)
+		def setJobError(self, i, iError):
+			showError(iSheets[i], "runBackground", "File is not exported correctly. " + iError)
+
+		@QtCore.Slot()
+		def setAllDone(self):
+			printMsg("\n")
+			if iDone != None:
+				iDone()
+			else:
+				showSummary()
+			self.deleteLater()
+
+	# ############################################################################
+	# final settings
+	# ############################################################################
+
+	# the object is kept by main window, so it works also after the macro is finished
+	vWorker = QtBackgroundClass()
+	threading.Thread(target=vWorker.run, daemon=True).start()
+
+	printMsg("\n")
+	printMsg(translate('sheet2export', 'Exporting in background, FreeCAD can be used, the summary is shown at the end.'))
+
+
+# ###################################################################################################################
+def stopWatch():
+
+	import FreeCADGui
+	from PySide import QtCore
+
+	vWindow = FreeCADGui.getMainWindow()
+	if vWindow == None:
+		return 0
+
+	# watch started by earlier macro run is kept by main window
+	vWatch = vWindow.findChild(QtCore.QObject, "sheet2exportWatch")
+	if vWatch != None:
+		vWatch.stop()
+		printMsg("\n")
+		printMsg(translate('sheet2export', 'Watch mode stopped.'))
+		printMsg("\n")
+
+
+# ###################################################################################################################
+def runWatch(iDocument, iNames):
+
+	import FreeCADGui
+	from PySide import QtCore
+
+	# ############################################################################
+	# Qt Watch Class
+	# ############################################################################
+
+	# FreeCAD calls the observer for each changed property, the timer starts again after each 
+	# change, so only the spreadsheets changed since last export are read and exported in background
+	class QtWatchClass(QtCore.QObject):
+
+		def __init__(self):
+			super(QtWatchClass, self).__init__(FreeCADGui.getMainWindow())
+			self.setObjectName("sheet2exportWatch")
+			self.document = iDocument.Name
+			self.pending = [] # names of changed spreadsheets
+			self.busy = False # background export is running
+			self.timer = QtCore.QTimer(self)
+			self.timer.setSingleShot(True)
+			self.timer.setInterval(int(sWatch * 1000))
+			self.timer.timeout.connect(self.runExport)
+			FreeCAD.addDocumentObserver(self)
+
+		# FreeCAD document observer
+		def slotChangedObject(self, iObj, iProp):
+
+			if iObj.Document.Name != self.document or not iObj.isDerivedFrom("Spreadsheet::Sheet"):
+				return
+
+			# empty list is for all spreadsheets
+			if len(iNames) > 0 and iObj.Name not in iNames:
+				return
+
+			if iObj.Name not in self.pending:
+				self.pending.append(iObj.Name)
+
+			self.timer.start()
+
+		def slotDeletedDocument(self, iDoc):
+			if iDoc.Name == self.document:
+				self.stop()
+
+		def stop(self):
+			self.timer.stop()
+			FreeCAD.removeDocumentObserver(self)
+			self.deleteLater()
+
+		# GUI thread, after the last change
+		def runExport(self):
+
+			global gAD, gSheet, gFile, gExpFilesN, gSkipFilesN, gFormulaN, gStats
+
+			# changes during background export are exported after it
+			if self.busy:
+				return
+
+			gAD = FreeCAD.getDocument(self.document)
+			gExpFilesN = ""
+			gSkipFilesN = ""
+			gFormulaN = ""
+			gStats = []
+
+			vSheets = []
+			vJobs = []
+
+			for vName in self.pending:
+
+				# spreadsheet can be removed after the change
+				gSheet = gAD.getObject(vName)
+				if gSheet == None:
+					continue
+
+				gFile = gAD.Label + " - " + gSheet.Label
+
+				printMsg("\n")
+				printMsg("Exporting: ")
+				printMsg(gSheet.Label + " ")
+
+				try:
+					vJob = getJob()
+					if vJob != None:
+						vSheets.append(gSheet)
+						vJobs.append(vJob)
+				except:
+					showError(gSheet, "getJob" , "Spreadsheet data is not read correctly.")
+
+			self.pending = []
+
+			if len(vJobs) == 0:
+				showSummary("no")
+				return
+
+			self.busy = True
+			runBackground(vSheets, vJobs, self.setDone)
+
+		def setDone(self, iBox="no"):
+
+			self.busy = False
+			showSummary(iBox)
+
+			if len(self.pending) > 0:
+				self.timer.start()
+
+		# background export started by the macro, not by the watch, e.g. the first export, 
+		# the changes during it are exported after it, so the same files are not written twice at once
+		def getDone(self):
+			self.busy = True
+			return lambda: self.setDone("yes")
+
+	# ############################################################################
+	# final settings
+	# ############################################################################
+
+	# the object is kept by main window, so it works also after the macro is finished
+	vWatch = QtWatchClass()
+
+	printMsg("\n")
+	printMsg(translate('sheet2export', 'Watch mode, changed spreadsheets are exported in background, run the macro with sWatch = 0 to stop.'))
+	printMsg("\n")
+
+	return vWatch
+
 
 # ###################################################################################################################
 # MAIN
 # ###################################################################################################################
 
 
-# show Qt box
-if sQT == "yes":
-	showQtMain()
+# run from command line without FreeCAD for batch export of FreeCAD files
+if __name__ == "__main__" and FreeCAD == None:
 
-# skip if cancel button
-if gExecute == "yes":
+	import sys
+	sys.exit(runBatch(sys.argv[1:]))
 
-	# set spreadsheet key databases
-	try:
-		setSK()
-	except:
-		showError(gAD, "setSK" , "Spreadsheet key databases is not set correctly.")
-	
-	# for selected
-	if sExportType == "s":
+# run only as macro, importing the file gives access to the export functions
+if __name__ == "__main__":
+
+	import FreeCADGui
+
+	# set reference point to Active Document and get all objects from 3D model
+	gAD = FreeCAD.activeDocument()
+	gOBs = gAD.Objects
+
+	# only one watch, it is stopped also by cancel button or sWatch = 0
+	stopWatch()
+
+	# show Qt box
+	if sQT == "yes":
+		showQtMain()
+
+	# skip if cancel button
+	if gExecute == "yes":
+
+		# watch is started before the first export, so changes during export are not lost
+		vWatch = None
+
+		# load list of already exported files
+		if sCache == "yes":
+			gCache = loadCache(sFilePath)
+
+		# set spreadsheet key databases
 		try:
-			# try set selected spreadsheet
-			gSheet = FreeCADGui.Selection.getSelection()[0]
+			setSK()
+		except:
+			showError(gAD, "setSK" , "Spreadsheet key databases is not set correctly.")
+	
+		# for selected
+		if sExportType == "s":
+			try:
+				# try set selected spreadsheet
+				gSheet = FreeCADGui.Selection.getSelection()[0]
 
-			# check if this is correct spreadsheet object
-			if gSheet.isDerivedFrom("Spreadsheet::Sheet"):
+				# check if this is correct spreadsheet object
+				if gSheet.isDerivedFrom("Spreadsheet::Sheet"):
 		
-				# set output filename
-				gFile = gAD.Label + " - " + gSheet.Label
+					# set output filename
+					gFile = gAD.Label + " - " + gSheet.Label
 		
-				# set info
-				FreeCAD.Console.PrintMessage("\n")
-				FreeCAD.Console.PrintMessage("Exporting: ")
-				FreeCAD.Console.PrintMessage(gSheet.Label + " ")
+					# set info
+					printMsg("\n")
+					printMsg("Exporting: ")
+					printMsg(gSheet.Label + " ")
 		
-				# create output file
-				runTasks()
-	
-				# info
-				info = ""
-				info += translate('sheet2export', 'Exported files')
-				info += ": \n\n" + str(gExpFilesN) + "\n\n"
-				showInfo(info)
-			else:
+					# create output file, in background only data are taken here
+					if askForExport([ gSheet ]) == "no":
+						showSummary()
+					else:
+						if sWatch > 0:
+							vWatch = runWatch(gAD, [ gSheet.Name ])
+
+						if sBackground == "yes":
+							vJob = getJob()
+							if vJob != None:
+								runBackground([ gSheet ], [ vJob ], vWatch.getDone() if vWatch != None else None)
+							else:
+								showSummary()
+						else:
+							runTasks()
+							showSummary()
+				else:
+					showInfo(translate('sheet2export', 'Please select spreadsheet to export.'))
+			except:
 				showInfo(translate('sheet2export', 'Please select spreadsheet to export.'))
-		except:
-			showInfo(translate('sheet2export', 'Please select spreadsheet to export.'))
 	
 		
-	# for all spreadsheets
-	elif sExportType == "a":
+		# for all spreadsheets
+		elif sExportType == "a":
 	
-		# search all objects and export spreadsheets
-		for obj in gOBs:
+			# spreadsheets for worker processes
+			vSheets = []
+			vJobs = []
+
+			# one question for all spreadsheets, before any of them is exported
+			vAll = [ obj for obj in gOBs if obj.isDerivedFrom("Spreadsheet::Sheet") ]
+			if askForExport(vAll) == "no":
+				vAll = []
+
+			# empty list is for all spreadsheets, also added later
+			if sWatch > 0 and len(vAll) > 0:
+				vWatch = runWatch(gAD, [])
+
+			# search all objects and export spreadsheets
+			for obj in vAll:
 	
-			# try set spreadsheet
-			gSheet = obj
+				# try set spreadsheet
+				gSheet = obj
 	
-			# check if this is correct spreadsheet object
-			if gSheet.isDerivedFrom("Spreadsheet::Sheet"):
+				# check if this is correct spreadsheet object
+				if gSheet.isDerivedFrom("Spreadsheet::Sheet"):
 	
-					# set output filename
-				gFile = gAD.Label + " - " + gSheet.Label
-			else:
-				continue
+						# set output filename
+					gFile = gAD.Label + " - " + gSheet.Label
+				else:
+					continue
 	
-			# set info
-			FreeCAD.Console.PrintMessage("\n")
-			FreeCAD.Console.PrintMessage("Exporting: ")
-			FreeCAD.Console.PrintMessage(gSheet.Label + " ")
+				# set info
+				printMsg("\n")
+				printMsg("Exporting: ")
+				printMsg(gSheet.Label + " ")
 			
-			# create output file
-			resetDB()
-			runTasks()
-
-		# info
-		info = ""
-		info += translate('sheet2export', 'Exported files')
-		info += ": \n\n" + str(gExpFilesN) + "\n\n"
-		showInfo(info)
-	else:
-		showError(gAD, "main", "Please set sExportType correctly.")
+				# create output file
+				if sJobs == 1 and sBackground == "no":
+					runTasks()
+				else:
+					try:
+						vJob = getJob()
+						if vJob != None:
+							vSheets.append(gSheet)
+							vJobs.append(vJob)
+					except:
+						showError(gSheet, "getJob" , "Spreadsheet data is not read correctly.")
+
+			# export in background, the summary is shown at the end
+			if sBackground == "yes" and len(vJobs) > 0:
+				runBackground(vSheets, vJobs, vWatch.getDone() if vWatch != None else None)
+
+			# export in worker processes
+			elif len(vJobs) > 0:
+				printMsg("\n")
+				printMsg("Exporting in " + str(sJobs) + " worker processes... ")
+				runJobs(vSheets, vJobs)
+				printMsg("done.")
+				showSummary()
+
+			# info
+			else:
+				showSummary()
+		else:
+			showError(gAD, "main", "Please set sExportType correctly.")
 
 
 # ###################################################################################################################